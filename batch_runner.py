@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Batch simulation runner for balance sweeps.
+Runs thousands of headless 60-second games across every CPU core, streams one
+JSON line per game to a results file and prints aggregate percentiles.
+
+Example grid file (every combination of values is simulated for every seed):
+
+    {
+        "meteor_spawn_rate": [800, 1000, 1200],
+        "power_up_durations.shield": [3000, 5000],
+        "meteor_speed_ranges.large": [[1, 3], [2, 4]]
+    }
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import space_shooter as game_module
+
+
+def expand_grid(grid):
+    """Return every combination of a {name: [values]} grid as a list of dicts"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def to_settings(params):
+    """Convert flat grid parameters (dotted names for table entries) into game settings"""
+    settings = {}
+    for name, value in params.items():
+        if "." in name:
+            table, key = name.split(".", 1)
+            settings.setdefault(table, {})[key] = tuple(value) if isinstance(value, list) else value
+        else:
+            settings[name] = value
+    return settings
+
+
+def make_policy(policy, seed):
+    """Create the input source a simulated player uses"""
+    if policy == "sweep":
+        return game_module.ScriptedInput(game_module.SWEEP_SCRIPT)
+    if policy == "random":
+        return game_module.RandomInput(seed)
+    raise ValueError(f"Unknown input policy: {policy}")
+
+
+def run_game(job):
+    """Simulate one headless game and return its result record"""
+    game_id, params_id, params, seed, policy, array_store = job
+    game = game_module.GameManager(headless=True, input_source=make_policy(policy, seed),
+                                   seed=seed, settings=to_settings(params),
+                                   array_store=array_store)
+    stats = game.run_headless()
+    return {
+        "game": game_id,
+        "params_id": params_id,
+        "params": params,
+        "seed": seed,
+        "policy": policy,
+        "score": stats["score"],
+        "lives_lost": stats["lives_lost"],
+        "power_ups_collected": stats["power_ups_collected"],
+        "peaks": stats["peaks"],
+        "frames": stats["frames"],
+        "steps_per_second": stats["fps"],
+    }
+
+
+def percentile(values, q):
+    """Return the q-th percentile (0-100) of a list using linear interpolation"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(results):
+    """Print score, lives-lost and throughput percentiles for each parameter set"""
+    groups = {}
+    for result in results:
+        groups.setdefault(result["params_id"], []).append(result)
+
+    for params_id in sorted(groups):
+        group = groups[params_id]
+        scores = [result["score"] for result in group]
+        lives = [result["lives_lost"] for result in group]
+        speeds = [result["steps_per_second"] for result in group]
+        print(f"[{params_id}] {json.dumps(group[0]['params'])} ({len(group)} games)")
+        print("    score p10/p50/p90: "
+              f"{percentile(scores, 10):.0f} / {percentile(scores, 50):.0f} / {percentile(scores, 90):.0f}")
+        print(f"    lives lost p50/p90: {percentile(lives, 50):.1f} / {percentile(lives, 90):.1f}"
+              f"    sim steps/s p50: {percentile(speeds, 50):.0f}")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run headless balance sweeps in parallel")
+    parser.add_argument("--grid", help="JSON file mapping setting names to lists of values")
+    parser.add_argument("--seeds", type=int, default=100,
+                        help="games per parameter set, seeded 0..N-1")
+    parser.add_argument("--policy", choices=["random", "sweep"], default="random",
+                        help="scripted input policy used by every simulated player")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="results.jsonl", help="per-game results file")
+    parser.add_argument("--array-store", action="store_true",
+                        help="simulate with NumPy-backed meteor and bullet storage")
+    args = parser.parse_args(argv)
+    if args.array_store and game_module.np is None:
+        parser.error("--array-store needs NumPy: pip install numpy")
+
+    # Expand and check the grid here so bad settings stop the run before any worker starts
+    grid = {}
+    if args.grid:
+        with open(args.grid) as grid_file:
+            grid = json.load(grid_file)
+    for name, values in grid.items():
+        if not isinstance(values, list):
+            parser.error(f"grid entry {name!r} must be a list of values, not {values!r}")
+    args.param_sets = expand_grid(grid)
+    for params in args.param_sets:
+        try:
+            game_module.merge_settings(to_settings(params))
+        except ValueError as error:
+            parser.error(f"{args.grid}: {error}")
+    return args
+
+
+def main(argv=None):
+    """Run the sweep described on the command line"""
+    args = parse_args(argv)
+    param_sets = args.param_sets
+
+    jobs = [
+        (game_id, params_id, params, seed, args.policy, args.array_store)
+        for game_id, (params_id, params, seed) in enumerate(
+            (params_id, params, seed)
+            for params_id, params in enumerate(param_sets)
+            for seed in range(args.seeds)
+        )
+    ]
+    print(f"Running {len(jobs)} games ({len(param_sets)} parameter sets x {args.seeds} seeds) "
+          f"on {args.workers} workers", file=sys.stderr)
+    results = []
+    start = time.perf_counter()
+    chunksize = max(1, len(jobs) // (args.workers * 8))
+    with open(args.out, "w") as out, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for result in pool.map(run_game, jobs, chunksize=chunksize):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            results.append(result)
+    elapsed = time.perf_counter() - start
+
+    summarize(results)
+    print(f"{len(results)} games in {elapsed:.1f}s ({len(results) / elapsed:.1f} games/s), "
+          f"results in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Reproducible performance benchmarks for the space shooter.
+Each scenario builds a seeded headless game directly from the game classes,
+steps it with scripted input and times the simulation and an offscreen render
+of every frame separately. A second, traced pass measures allocations, and a
+snapshot round trip checks that a restored game replays its original exactly.
+Timings are the median of --repeat runs; gating needs at least three in both
+the run and the baseline, and a baseline recorded with another storage mode or
+seed is refused.
+
+    python benchmarks.py --save-baseline baseline.json      # record a baseline
+    python benchmarks.py --baseline baseline.json           # exit 1 on regressions
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import space_shooter as game_module
+
+# Metrics where a larger value is worse, compared against the baseline
+GATED_METRICS = ("sim_ms_mean", "sim_ms_p95", "render_ms_mean", "render_ms_p95",
+                 "alloc_kib_per_frame", "peak_mib", "snapshot_us", "restore_us")
+# Frame timings reported as the median over --repeat runs
+TIMED_METRICS = ("sim_ms_mean", "sim_ms_p95", "render_ms_mean", "render_ms_p95")
+# Absolute growth a frame time must also exceed to count as a regression, about
+# 3% of the 60 FPS budget for means; sub-millisecond timings, p95 ones above
+# all, swing by well over the relative threshold from run to run
+NOISE_FLOORS = {"sim_ms_mean": 0.5, "render_ms_mean": 0.5, "sim_ms_p95": 1.0, "render_ms_p95": 1.0}
+# Fewest timed runs whose median is steady enough to gate on
+MIN_GATED_REPEAT = 3
+# Run settings a baseline must share to be compared at all, and ones that only skew timings
+REQUIRED_MATCH = ("array_store", "seed")
+WARN_MISMATCH = ("python", "machine")
+
+
+class ShootInput:
+    """Input source that holds the fire button and sweeps left and right"""
+
+    def __init__(self, period=120):
+        self.period = period
+        self.frame = 0
+
+    def next_input(self):
+        """Return fire plus the current sweep direction"""
+        self.frame += 1
+        direction = game_module.INPUT_LEFT if (self.frame // self.period) % 2 else game_module.INPUT_RIGHT
+        return game_module.INPUT_SHOOT | direction
+
+
+def grant(player, *powers):
+    """Switch effects on for good; no expiry is scheduled for them"""
+    for power in powers:
+        setattr(player, power, True)
+
+
+def fill_meteors(game, count):
+    """Top the meteor list up to count, spread over the upper half of the screen"""
+    rng = game.rng
+    while len(game.meteors) < count:
+        size_type = "large" if rng.random() < 0.5 else "small"
+        x = rng.randint(0, game_module.SCREEN_WIDTH - 40)
+        y = rng.randint(-game_module.SCREEN_HEIGHT // 2, game_module.SCREEN_HEIGHT // 2)
+        game.meteors.append(game.make_meteor(x, y, size_type))
+
+
+def meteor_storm(game):
+    """500 meteors against triple-shot rapid fire"""
+    grant(game.player, "triple_shot", "rapid_fire", "invincible")
+    fill_meteors(game, 500)
+
+
+def laser_barrage(game):
+    """A permanent laser beam sweeping through 200 meteors"""
+    grant(game.player, "laser_beam", "invincible")
+    fill_meteors(game, 200)
+
+
+def explosion_burst(game):
+    """50 simultaneous large explosions, set off again once they all finish"""
+    if game.explosions:
+        return
+    rng = game.rng
+    for _ in range(50):
+        x = rng.randint(50, game_module.SCREEN_WIDTH - 50)
+        y = rng.randint(50, game_module.SCREEN_HEIGHT - 150)
+        game.explosions.append(game.make_explosion(x, y, "large"))
+
+
+def full_game(game):
+    """An untouched 60-second game with the scripted sweep player"""
+
+
+# name: (per-frame setup, frames, input source factory)
+SCENARIOS = {
+    "meteor_storm": (meteor_storm, 300, ShootInput),
+    "laser_barrage": (laser_barrage, 300, ShootInput),
+    "explosion_burst": (explosion_burst, 240, lambda: None),
+    "full_game": (full_game, 3600, lambda: game_module.ScriptedInput(game_module.SWEEP_SCRIPT)),
+}
+
+
+def new_game(name, seed, array_store):
+    """Build the seeded headless game a scenario runs on"""
+    setup, frames, make_input = SCENARIOS[name]
+    game = game_module.GameManager(headless=True, input_source=make_input(), seed=seed,
+                                   array_store=array_store)
+    return game, setup, frames
+
+
+def render_offscreen(game, surface):
+    """Draw a full frame of the game to a surface that is never displayed"""
+    game.starfield.draw(surface)
+    game.draw_entities(surface)
+    game.hud.draw(surface, game)
+
+
+def percentile(values, q):
+    """Return the q-th percentile (0-100) of a list by nearest rank"""
+    ordered = sorted(values)
+    return ordered[round((len(ordered) - 1) * q / 100)] if ordered else 0.0
+
+
+def time_scenario(name, seed, array_store):
+    """Return per-frame simulation and render times in milliseconds"""
+    game, setup, frames = new_game(name, seed, array_store)
+    surface = pygame.Surface((game_module.SCREEN_WIDTH, game_module.SCREEN_HEIGHT))
+    sim, render = [], []
+    collections = gc.get_stats()[0]["collections"]
+    clock = time.perf_counter_ns
+    for _ in range(frames):
+        if game.game_over:
+            break
+        setup(game)
+        start = clock()
+        game.step()
+        middle = clock()
+        render_offscreen(game, surface)
+        render.append((clock() - middle) / 1e6)
+        sim.append((middle - start) / 1e6)
+    return {
+        "frames": len(sim),
+        "sim_ms_mean": sum(sim) / len(sim),
+        "sim_ms_p95": percentile(sim, 95),
+        "render_ms_mean": sum(render) / len(render),
+        "render_ms_p95": percentile(render, 95),
+        "gc_gen0_per_1000_frames": (gc.get_stats()[0]["collections"] - collections) * 1000 / len(sim),
+        "score": game.score,
+    }
+
+
+def trace_scenario(name, seed, array_store):
+    """Return the mean transient allocation per frame and the traced peak memory"""
+    game, setup, frames = new_game(name, seed, array_store)
+    surface = pygame.Surface((game_module.SCREEN_WIDTH, game_module.SCREEN_HEIGHT))
+    tracemalloc.start()
+    allocated = peak = 0
+    traced = 0
+    for _ in range(frames):
+        if game.game_over:
+            break
+        setup(game)
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        game.step()
+        render_offscreen(game, surface)
+        frame_peak = tracemalloc.get_traced_memory()[1]
+        allocated += frame_peak - before
+        peak = max(peak, frame_peak)
+        traced += 1
+    tracemalloc.stop()
+    return {
+        "alloc_kib_per_frame": allocated / traced / 1024,
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def median_runs(runs):
+    """Combine repeated time_scenario runs; each timing is their median (p50)"""
+    result = dict(runs[0])
+    for metric in TIMED_METRICS:
+        result[metric] = percentile([run[metric] for run in runs], 50)
+    return result
+
+
+def restored_pair(seed=1, array_store=False, warmup=1800):
+    """Play a game to mid-game, snapshot it and restore that into a fresh game
+    
+    The restored game is built with a different seed so nothing carries over
+    except the snapshot. Returns the original, the restored game and the data.
+    """
+    game = game_module.GameManager(headless=True, input_source=game_module.RandomInput(seed),
+                                   seed=seed, array_store=array_store)
+    for _ in range(warmup):
+        game.step()
+    data = game.snapshot()
+    restored = game_module.GameManager(headless=True, input_source=copy.deepcopy(game.input_source),
+                                       seed=seed + 1, array_store=array_store)
+    restored.restore_snapshot(data)
+    return game, restored, data
+
+
+def time_snapshot(game, restored, data, samples=1000):
+    """Return the mean snapshot() and restore_snapshot() times in microseconds"""
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(samples):
+        game.snapshot()
+    snapshot_us = (clock() - start) / samples / 1000
+    start = clock()
+    for _ in range(samples):
+        restored.restore_snapshot(data)
+    return snapshot_us, (clock() - start) / samples / 1000
+
+
+def lockstep_mismatch(game, restored, data, frames=600):
+    """Step a game and its restored copy together; return the first frame they differ, or None"""
+    if restored.snapshot() != data:
+        return restored.sim_clock.frame
+    for _ in range(frames):
+        game.step()
+        restored.step()
+        if game.snapshot() != restored.snapshot():
+            return game.sim_clock.frame
+    return None
+
+
+def snapshot_result(game, data, timings, mismatch):
+    """Summarize a round trip: median timings, the buffer size and the first mismatching frame"""
+    return {
+        "snapshot_us": percentile([saved for saved, _ in timings], 50),
+        "restore_us": percentile([restored for _, restored in timings], 50),
+        "snapshot_bytes": len(data),
+        "entities": len(game.meteors) + len(game.bullets) + len(game.power_ups) + len(game.explosions),
+        "mismatch_frame": mismatch,
+    }
+
+
+def run_settings(args):
+    """Return the settings recorded with a baseline and checked against it"""
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "array_store": args.array_store, "seed": args.seed, "repeat": args.repeat}
+
+
+def settings_mismatches(current, recorded, names):
+    """Return a message for every named setting the baseline recorded with another value"""
+    return [f"{name}: baseline {recorded[name]!r}, this run {current[name]!r}"
+            for name in names if name in recorded and recorded[name] != current[name]]
+
+
+def compare(results, baseline, threshold):
+    """Return a message for every gated metric more than threshold worse than the baseline
+    
+    A metric with a noise floor must also have grown by more than the floor.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in GATED_METRICS:
+            old, new = reference.get(metric), metrics.get(metric)
+            if (old and new is not None and new > old * (1 + threshold)
+                    and new - old > NOISE_FLOORS.get(metric, 0.0)):
+                regressions.append(f"{name}.{metric}: {old:.3f} -> {new:.3f} "
+                                   f"(+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the space shooter")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per scenario; timings are their median "
+                             f"(at least {MIN_GATED_REPEAT} with --baseline)")
+    parser.add_argument("--array-store", action="store_true",
+                        help="benchmark NumPy-backed meteor and bullet storage")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed fractional regression per metric (default: 0.25)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write these results as a baseline")
+    args = parser.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+    if args.array_store and game_module.np is None:
+        parser.error("--array-store needs NumPy: pip install numpy")
+    if args.baseline and args.repeat < MIN_GATED_REPEAT:
+        parser.error(f"--baseline needs --repeat {MIN_GATED_REPEAT} or more; "
+                     "a single run is too noisy to gate on")
+    return args
+
+
+def main(argv=None):
+    """Run the benchmarks, report them and gate on the baseline"""
+    args = parse_args(argv)
+    names = args.scenarios or list(SCENARIOS)
+    settings = run_settings(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        # Refuse before spending minutes on a run that cannot be compared
+        mismatches = settings_mismatches(settings, baseline, REQUIRED_MATCH)
+        if baseline.get("repeat", 0) < MIN_GATED_REPEAT:
+            mismatches.append(f"repeat: baseline {baseline.get('repeat')!r}, gating needs "
+                              f"at least {MIN_GATED_REPEAT}; save it again with a higher --repeat")
+        if mismatches:
+            print(f"Baseline {args.baseline} was recorded with different settings:")
+            for message in mismatches:
+                print(f"  {message}")
+            return 2
+
+    game_module.meteor_sprites.prerender()
+    game_module.sprite_atlas.build()
+
+    # Repeats run in rounds over every scenario and the snapshot loops, so a slow
+    # spell on the machine costs each metric one sample rather than all of them
+    runs = {name: [] for name in names}
+    game, restored, data = restored_pair(args.seed, args.array_store)
+    timings = []
+    for _ in range(args.repeat):
+        for name in names:
+            runs[name].append(time_scenario(name, args.seed, args.array_store))
+        timings.append(time_snapshot(game, restored, data))
+
+    results = {}
+    for name in names:
+        result = results[name] = median_runs(runs[name])
+        result.update(trace_scenario(name, args.seed, args.array_store))
+        print(f"{name:<16} sim {result['sim_ms_mean']:.3f}/{result['sim_ms_p95']:.3f} ms  "
+              f"render {result['render_ms_mean']:.3f}/{result['render_ms_p95']:.3f} ms  "
+              f"alloc {result['alloc_kib_per_frame']:.1f} KiB/frame  "
+              f"peak {result['peak_mib']:.2f} MiB  ({result['frames']} frames, mean/p95)")
+    
+    mismatch = lockstep_mismatch(game, restored, data)
+    result = results["snapshot"] = snapshot_result(game, data, timings, mismatch)
+    print(f"{'snapshot':<16} save {result['snapshot_us']:.1f} us  restore {result['restore_us']:.1f} us  "
+          f"{result['snapshot_bytes']} bytes  ({result['entities']} entities)")
+    if result["mismatch_frame"] is not None:
+        print(f"Restored game diverged from the original at frame {result['mismatch_frame']}")
+        return 1
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump(dict(settings, scenarios=results), baseline_file, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+        if args.repeat < MIN_GATED_REPEAT:
+            print(f"Warning: runs cannot be gated against a baseline saved with "
+                  f"--repeat below {MIN_GATED_REPEAT}")
+
+    if baseline is not None:
+        for message in settings_mismatches(settings, baseline, WARN_MISMATCH):
+            print(f"Warning: timings may not be comparable ({message})")
+        regressions = compare(results, baseline["scenarios"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed more than {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
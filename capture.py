@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Asynchronous frame capture for the space shooter.
+FrameCapture copies every presented frame straight out of the display
+surface's pixel buffer into one of a small ring of preallocated buffers; a
+writer thread turns them into a raw file, a PNG sequence or the stdin of an
+encoder process. When the writer falls behind and the ring is full, frames are
+dropped and counted rather than stalling the game loop.
+
+    python space_shooter.py --capture gameplay.raw        # raw frames, one file
+    python space_shooter.py --capture frames/%05d.png     # PNG sequence
+    python space_shooter.py --capture gameplay.mp4        # piped to ffmpeg
+    python capture.py --frames 600 --output /tmp/bench.raw  # capture benchmark
+"""
+
+import argparse
+import os
+import queue
+import shlex
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+# Byte order of a frame in memory -> ffmpeg rawvideo pixel format
+FFMPEG_PIXEL_FORMATS = {"BGRX": "bgr0", "RGBX": "rgb0", "XRGB": "0rgb", "XBGR": "0bgr",
+                        "BGRA": "bgra", "RGBA": "rgba", "BGR": "bgr24", "RGB": "rgb24"}
+ENCODER_COMMAND = ("ffmpeg -loglevel error -y -f rawvideo -pix_fmt {pixel_format} "
+                   "-s {width}x{height} -r {fps} -i - -pix_fmt yuv420p {path}")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# width, height, bit depth, colour type, compression, filter and interlace methods
+PNG_HEADER = struct.Struct(">IIBBBBB")
+PNG_CHUNK_LENGTH = struct.Struct(">I")
+RGB_MASKS = (0xFF, 0xFF00, 0xFF0000, 0)  # 24-bit surface whose bytes are in R, G, B order
+
+
+def byte_order(surface):
+    """Return the channel stored in each byte of a pixel, e.g. "BGRX" for 32-bit XRGB"""
+    if sys.byteorder != "little":
+        raise ValueError("Frame capture assumes a little-endian machine")
+    masks = surface.get_masks()
+    channels = {shift: name for name, mask, shift in zip("RGBA", masks, surface.get_shifts()) if mask}
+    return "".join(channels.get(8 * index, "X") for index in range(surface.get_bytesize()))
+
+
+def png_chunk(kind, data):
+    """Frame one PNG chunk: length, type, data and CRC"""
+    return (PNG_CHUNK_LENGTH.pack(len(data)) + kind + data
+            + PNG_CHUNK_LENGTH.pack(zlib.crc32(data, zlib.crc32(kind))))
+
+
+def output_mode(path):
+    """Pick the writer for a capture path: "png" for a %-pattern, "raw" for .raw, else "pipe\""""
+    if "%" in path:
+        return "png"
+    if path.endswith(".raw"):
+        return "raw"
+    return "pipe"
+
+
+class FrameCapture:
+    """Copies presented frames into a ring of preallocated buffers for a writer thread
+
+    Attach it as ``game.capture``; GameManager.draw() calls capture() after
+    every presented frame. The game thread only copies pixels and queues a
+    buffer index; it never encodes, allocates a Surface or waits on disk.
+    """
+
+    def __init__(self, path, surface, ring_size=8, fps=60, command=None, mode=None, png_level=3):
+        self.path = path
+        self.mode = mode or output_mode(path)
+        self.size = surface.get_size()
+        width, height = self.size
+        self.frame_bytes = surface.get_pitch() * height
+        if surface.get_pitch() != width * surface.get_bytesize():
+            raise ValueError("Frame capture needs a surface without row padding")
+        self.byte_order = byte_order(surface)
+        self.masks = surface.get_masks()
+        self.bitsize = surface.get_bitsize()
+
+        self.buffers = [bytearray(self.frame_bytes) for _ in range(ring_size)]
+        self.views = [memoryview(buffer) for buffer in self.buffers]
+        self.free = queue.SimpleQueue()  # indices of buffers the game may fill
+        for index in range(ring_size):
+            self.free.put(index)
+        self.filled = queue.SimpleQueue()  # (buffer index, frame number) waiting to be written
+
+        self.frames = 0  # frames offered to capture()
+        self.dropped = 0
+        self.written = 0
+        self.capture_ns = 0  # game-thread time spent in capture()
+        self.capture_ns_max = 0
+        self.write_ns = 0  # writer-thread time spent encoding and writing
+        self.error = None
+
+        self.output = None
+        self.process = None
+        self.frame_surface = None
+        self.rgb_surface = None
+        self.png_header = None
+        self.png_level = png_level
+        if self.mode == "raw":
+            self.output = open(path, "wb")
+        elif self.mode == "png":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.frame_surface = pygame.Surface(self.size, 0, self.bitsize, self.masks)
+            self.rgb_surface = pygame.Surface(self.size, 0, 24, RGB_MASKS)
+            header = PNG_HEADER.pack(width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+            self.png_header = PNG_SIGNATURE + png_chunk(b"IHDR", header)
+        elif self.mode == "pipe":
+            if self.byte_order not in FFMPEG_PIXEL_FORMATS:
+                raise ValueError(f"No encoder pixel format for {self.byte_order} frames")
+            command = (command or ENCODER_COMMAND).format(
+                pixel_format=FFMPEG_PIXEL_FORMATS[self.byte_order], width=width, height=height,
+                fps=fps, path=shlex.quote(path))
+            self.process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE)
+            self.output = self.process.stdin
+        else:
+            raise ValueError(f"Unknown capture mode: {self.mode}")
+
+        self.thread = threading.Thread(target=self.write_frames, name="capture", daemon=True)
+        self.thread.start()
+
+    def capture(self, surface):
+        """Copy a presented frame into a free buffer, or count it as dropped if none is free"""
+        start = time.perf_counter_ns()
+        frame = self.frames
+        self.frames += 1
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1  # the writer is behind: back off rather than stall the game
+        else:
+            self.views[index][:] = surface.get_buffer()
+            self.filled.put((index, frame))
+        elapsed = time.perf_counter_ns() - start
+        self.capture_ns += elapsed
+        if elapsed > self.capture_ns_max:
+            self.capture_ns_max = elapsed
+
+    def write_frames(self):
+        """Writer thread: encode filled buffers in order and hand them back to the ring"""
+        while True:
+            item = self.filled.get()
+            if item is None:
+                return
+            index, frame = item
+            start = time.perf_counter_ns()
+            try:
+                if self.error is None:
+                    self.write_frame(self.views[index], frame)
+                    self.written += 1
+            except (OSError, pygame.error, zlib.error) as error:
+                self.error = error  # keep draining so the game thread never blocks
+            self.write_ns += time.perf_counter_ns() - start
+            self.free.put(index)
+
+    def write_frame(self, view, frame):
+        """Write one frame in the capture's output format"""
+        if self.mode == "png":
+            self.write_png(view, self.path % frame)
+        else:
+            self.output.write(view)
+
+    def write_png(self, view, path):
+        """Encode a frame as an RGB PNG
+
+        pygame.image.save holds the GIL for the whole encode, which would stall
+        the game thread for tens of milliseconds a frame. The blit to RGB and
+        zlib.compress both run without the GIL, so this encoder does not.
+        """
+        with memoryview(self.frame_surface.get_buffer()) as pixels:
+            pixels[:] = view
+        self.rgb_surface.blit(self.frame_surface, (0, 0))
+        width, height = self.size
+        pitch = self.rgb_surface.get_pitch()
+        row = width * 3
+        with memoryview(self.rgb_surface.get_buffer()) as pixels:
+            # Every scanline starts with filter type 0 (none)
+            scanlines = b"".join(b"\x00" + pixels[offset:offset + row]
+                                 for offset in range(0, pitch * height, pitch))
+        data = zlib.compress(scanlines, self.png_level)
+        with open(path, "wb") as png_file:
+            png_file.write(self.png_header + png_chunk(b"IDAT", data) + png_chunk(b"IEND", b""))
+
+    def close(self):
+        """Write every queued frame, close the output and return the capture statistics"""
+        self.filled.put(None)
+        self.thread.join()
+        if self.output is not None:
+            try:
+                self.output.close()
+            except OSError as error:
+                self.error = self.error or error
+        if self.process is not None:
+            self.process.wait()
+        return self.stats()
+
+    def stats(self):
+        """Return frame counts and the per-frame capture and write costs"""
+        return {
+            "frames": self.frames,
+            "written": self.written,
+            "dropped": self.dropped,
+            "capture_us_mean": self.capture_ns / self.frames / 1000 if self.frames else 0.0,
+            "capture_us_max": self.capture_ns_max / 1000,
+            "write_ms_mean": self.write_ns / self.written / 1e6 if self.written else 0.0,
+            "error": self.error,
+        }
+
+    def describe(self):
+        """One-line summary for the end of a captured session"""
+        stats = self.stats()
+        width, height = self.size
+        line = (f"Captured {stats['written']} of {stats['frames']} frames to {self.path} "
+                f"({stats['dropped']} dropped; {width}x{height} {self.byte_order}): "
+                f"{stats['capture_us_mean']:.0f} us/frame in the game loop "
+                f"(max {stats['capture_us_max']:.0f}), {stats['write_ms_mean']:.2f} ms/frame writing")
+        if stats["error"] is not None:
+            line += f"; writer stopped: {stats['error']}"
+        return line
+
+
+def benchmark(path, frames=600, ring_size=8, mode=None, command=None):
+    """Render a scripted game offscreen at full speed and capture every frame"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import space_shooter as game_module
+    game = game_module.GameManager(input_source=game_module.ScriptedInput(game_module.SWEEP_SCRIPT),
+                                   seed=1)
+    game_module.meteor_sprites.prerender()
+    capture = game.capture = FrameCapture(path, game.screen, ring_size=ring_size, mode=mode,
+                                          command=command)
+    draw_ns = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.step()
+        before = time.perf_counter_ns()
+        game.draw()
+        draw_ns += time.perf_counter_ns() - before
+    elapsed = time.perf_counter() - start
+    capture.close()
+    return capture, elapsed, draw_ns / frames / 1e6
+
+
+def main(argv=None):
+    """Measure capture overhead and dropped frames with a full-speed offscreen game"""
+    parser = argparse.ArgumentParser(description="Benchmark asynchronous frame capture")
+    parser.add_argument("--output", default="capture-benchmark.raw",
+                        help="capture path: .raw, a %%05d.png pattern or a video file for ffmpeg")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--ring-size", type=int, default=8, help="preallocated frame buffers")
+    parser.add_argument("--command", help="encoder command template for piped output")
+    args = parser.parse_args(argv)
+
+    capture, elapsed, draw_ms = benchmark(args.output, args.frames, args.ring_size,
+                                          command=args.command)
+    print(f"{args.frames} frames in {elapsed:.2f}s ({args.frames / elapsed:.0f} FPS), "
+          f"draw incl. capture {draw_ms:.2f} ms/frame")
+    print(capture.describe())
+    return 1 if capture.error is not None else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
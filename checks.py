@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Consistency checks for the space shooter that need no benchmark run.
+Each check builds its own games, exercises one guarantee and returns a list
+of failure messages; the script exits 1 if any check fails. The snapshot check
+reuses the round-trip helpers from benchmarks.py without timing anything.
+
+    python checks.py                    # run every check
+    python checks.py rendering_games    # run the named checks only
+"""
+
+import argparse
+import os
+import random
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import benchmarks
+import space_shooter as game_module
+
+
+def render_frames(game, frames):
+    """Step and draw a windowed game, then shut pygame down as GameManager.run() does"""
+    for _ in range(frames):
+        game.step()
+        game.draw()
+    pygame.quit()
+
+
+def rendering_games():
+    """Two windowed games in one process; the second outlives the first's font session"""
+    failures = []
+    for seed, frames in ((1, 30), (2, 400)):
+        game = game_module.GameManager(input_source=game_module.ScriptedInput(game_module.SWEEP_SCRIPT),
+                                       seed=seed)
+        try:
+            render_frames(game, frames)
+        except pygame.error as error:
+            failures.append(f"game {seed}: {error}")
+    return failures
+
+
+def swept_exit():
+    """A coarse-tick bullet leaving the top of the screen still hits a meteor it passes on the way"""
+    failures = []
+    for array_store in (False, True):
+        game = game_module.GameManager(headless=True, input_source=game_module.ScriptedInput([0]),
+                                       seed=1, tick_rate=10, array_store=array_store)
+        # The meteor straddles the top edge; the bullet ends the step above the screen
+        game.meteors.append(game.make_meteor(400, -35, "large"))
+        game.bullets.append(game.player.make_bullet(410, 30))
+        game.update_game_objects()
+        game.check_collisions()
+        if game.meteors:
+            failures.append(f"array_store={array_store}: the bullet was culled before its swept test")
+    return failures
+
+
+def snapshot_round_trip():
+    """A snapshot restored into a fresh game keeps integer spawn rates and replays the original"""
+    failures = []
+    for array_store in (False, True):
+        game, restored, data = benchmarks.restored_pair(array_store=array_store)
+        for name in ("meteor_spawn_rate", "power_up_spawn_rate"):
+            if type(getattr(restored, name)) is not int:
+                failures.append(f"array_store={array_store}: {name} restored as "
+                                f"{type(getattr(restored, name)).__name__}")
+        mismatch = benchmarks.lockstep_mismatch(game, restored, data)
+        if mismatch is not None:
+            failures.append(f"array_store={array_store}: diverged at frame {mismatch}")
+    return failures
+
+
+def particle_ring():
+    """Once the particle ring wraps, an older explosion loses its overwritten rows to the newer one"""
+    engine = game_module.ParticleEngine(capacity=24)
+    older = game_module.ParticleExplosion(engine, 100, 100, "large", random.Random(1))
+    newer = game_module.ParticleExplosion(engine, 500, 300, "large", random.Random(2))
+    blits = []
+    older.add_blits(blits)
+    failures = []
+    if len(blits) != 24 - 15:
+        failures.append(f"older explosion drew {len(blits)} particles, expected {24 - 15}")
+    rect = older.get_draw_rect()
+    if rect is None or rect.right > 300:
+        failures.append(f"older explosion's draw rect {rect} reaches the newer explosion")
+    blits = []
+    newer.add_blits(blits)
+    if len(blits) != 15:
+        failures.append(f"newer explosion drew {len(blits)} particles, expected 15")
+    return failures
+
+
+CHECKS = {
+    "rendering_games": rendering_games,
+    "swept_exit": swept_exit,
+    "snapshot_round_trip": snapshot_round_trip,
+    "particle_ring": particle_ring,
+}
+
+
+def main(argv=None):
+    """Run the requested checks and report every failure"""
+    parser = argparse.ArgumentParser(description="Run space shooter consistency checks")
+    parser.add_argument("checks", nargs="*", metavar="CHECK",
+                        help=f"checks to run: {', '.join(CHECKS)} (default: all)")
+    args = parser.parse_args(argv)
+    for name in args.checks:
+        if name not in CHECKS:
+            parser.error(f"unknown check {name!r}")
+
+    failed = 0
+    for name in args.checks or list(CHECKS):
+        failures = CHECKS[name]()
+        print(f"{name:<22}{'ok' if not failures else 'FAILED'}")
+        for message in failures:
+            print(f"  {message}")
+        failed += bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
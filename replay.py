@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Input recording and deterministic replay for the space shooter.
+A game is fully determined by its seed, settings, tick rate and the input
+bitmask it read on every frame, so a replay file stores only those: a small
+header and the per-frame masks run-length encoded as (mask, varint count) pairs.
+
+    python space_shooter.py --record session.cdr        # play and record
+    python space_shooter.py --replay session.cdr        # watch it again
+    python replay.py session.cdr --seek 3000            # jump ahead headless
+"""
+
+import argparse
+import bisect
+import json
+import os
+import struct
+import time
+
+MAGIC = b"CDRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBq")  # magic, version, seed
+LENGTH = struct.Struct("<I")
+
+
+def write_varint(out, value):
+    """Append an unsigned LEB128 integer to a bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """Decode an unsigned LEB128 integer; return (value, next position)"""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputRecorder:
+    """Collects the input bitmask of every simulated frame and writes a replay file
+
+    Attach it as ``game.recorder``; GameManager.step() calls record() once per frame.
+    """
+
+    def __init__(self, path, seed, settings=None, tick_rate=60):
+        self.path = path
+        self.seed = seed
+        self.settings = settings or {}
+        self.tick_rate = tick_rate
+        self.body = bytearray()
+        self.mask = None
+        self.count = 0
+        self.frames = 0
+
+    def record(self, bits):
+        """Append one frame's input mask, extending the current run when unchanged"""
+        if bits == self.mask:
+            self.count += 1
+        else:
+            self.flush_run()
+            self.mask = bits
+            self.count = 1
+        self.frames += 1
+
+    def flush_run(self):
+        """Encode the pending run of identical masks"""
+        if self.count:
+            self.body.append(self.mask)
+            write_varint(self.body, self.count)
+            self.count = 0
+
+    def close(self):
+        """Write the header and every recorded frame to disk; return the file size"""
+        self.flush_run()
+        self.mask = None
+        metadata = json.dumps({"settings": self.settings, "tick_rate": self.tick_rate},
+                              separators=(",", ":")).encode()
+        with open(self.path, "wb") as replay_file:
+            replay_file.write(HEADER.pack(MAGIC, VERSION, self.seed))
+            replay_file.write(LENGTH.pack(len(metadata)))
+            replay_file.write(metadata)
+            replay_file.write(self.body)
+        return HEADER.size + LENGTH.size + len(metadata) + len(self.body)
+
+
+def load_replay(path):
+    """Read a replay file; return (seed, metadata, per-frame input masks)"""
+    with open(path, "rb") as replay_file:
+        data = replay_file.read()
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a replay file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported replay version {version}")
+    pos = HEADER.size
+    (length,) = LENGTH.unpack_from(data, pos)
+    pos += LENGTH.size
+    metadata = json.loads(data[pos:pos + length])
+    pos += length
+
+    inputs = bytearray()
+    while pos < len(data):
+        mask = data[pos]
+        count, pos = read_varint(data, pos + 1)
+        inputs.extend(bytes((mask,)) * count)
+    return seed, metadata, inputs
+
+
+def settings_from_json(settings):
+    """Restore the tuples JSON turned into lists"""
+    return {
+        name: {key: tuple(value) if isinstance(value, list) else value
+               for key, value in table.items()} if isinstance(table, dict) else table
+        for name, table in settings.items()
+    }
+
+
+class ReplayPlayer:
+    """Feeds a recorded input log back into a GameManager frame for frame
+
+    Snapshots of the full simulation state are taken every keyframe_interval
+    frames while fast-forwarding, so seek() only ever re-simulates from the
+    nearest keyframe at or before the target.
+    """
+
+    def __init__(self, path, keyframe_interval=300, game_class=None):
+        self.seed, metadata, self.inputs = load_replay(path)
+        self.settings = settings_from_json(metadata["settings"])
+        self.tick_rate = metadata["tick_rate"]
+        self.keyframe_interval = keyframe_interval
+        if game_class is None:
+            # Imported lazily so space_shooter can import this module from __main__
+            from space_shooter import GameManager as game_class
+        self.game_class = game_class
+        self.game = None
+        self.keyframes = {}
+        self.keyframe_frames = []
+
+    @property
+    def frames(self):
+        """Number of recorded frames"""
+        return len(self.inputs)
+
+    def next_input(self):
+        """Input source hook: return the recorded mask for the frame being simulated"""
+        frame = self.game.sim_clock.frame
+        return self.inputs[frame] if frame < len(self.inputs) else 0
+
+    def new_game(self, headless=True, **kwargs):
+        """Create the game the recording was made with, positioned at frame 0"""
+        self.game = self.game_class(headless=headless, input_source=self, seed=self.seed,
+                                    settings=self.settings, tick_rate=self.tick_rate, **kwargs)
+        self.keyframes = {}
+        self.keyframe_frames = []
+        self.add_keyframe()
+        return self.game
+
+    def add_keyframe(self):
+        """Store the current state if this frame has no keyframe yet"""
+        frame = self.game.sim_clock.frame
+        if frame not in self.keyframes:
+            self.keyframes[frame] = self.game.snapshot()
+            bisect.insort(self.keyframe_frames, frame)
+
+    def fast_forward(self, frame):
+        """Simulate without rendering up to a frame, keyframing along the way"""
+        game = self.game
+        frame = min(frame, self.frames)
+        while game.sim_clock.frame < frame:
+            game.step()
+            if game.sim_clock.frame % self.keyframe_interval == 0:
+                self.add_keyframe()
+        return game
+
+    def seek(self, frame):
+        """Jump to a frame, restoring the nearest earlier keyframe when seeking back or far ahead"""
+        if self.game is None:
+            self.new_game()
+        frame = max(0, min(frame, self.frames))
+        current = self.game.sim_clock.frame
+        index = bisect.bisect_right(self.keyframe_frames, frame) - 1
+        keyframe = self.keyframe_frames[index]
+        if frame < current or keyframe > current:
+            self.game.restore_snapshot(self.keyframes[keyframe])
+        return self.fast_forward(frame)
+
+    def build_index(self):
+        """Simulate the whole recording once so every later seek is keyframe-local"""
+        self.fast_forward(self.frames)
+        return len(self.keyframe_frames)
+
+
+def main(argv=None):
+    """Replay a recording headless and report how long seeking takes"""
+    parser = argparse.ArgumentParser(description="Inspect and seek through a replay file")
+    parser.add_argument("path", help="replay file written by space_shooter.py --record")
+    parser.add_argument("--seek", type=int, action="append", default=[],
+                        help="frame to jump to (may be given several times)")
+    parser.add_argument("--keyframe-interval", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    player = ReplayPlayer(args.path, keyframe_interval=args.keyframe_interval)
+    print(f"{args.path}: seed {player.seed}, {player.frames} frames, "
+          f"{os.path.getsize(args.path)} bytes")
+
+    player.new_game()
+    start = time.perf_counter()
+    player.build_index()
+    game = player.game
+    print(f"Full replay in {time.perf_counter() - start:.3f}s: score {game.score}, "
+          f"{len(player.keyframe_frames)} keyframes")
+
+    for frame in args.seek:
+        start = time.perf_counter()
+        game = player.seek(frame)
+        print(f"Seek to frame {game.sim_clock.frame} in {(time.perf_counter() - start) * 1000:.1f}ms: "
+              f"score {game.score}, lives {game.player.lives}")
+
+
+if __name__ == "__main__":
+    main()
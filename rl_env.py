@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Reinforcement-learning environments for the space shooter.
+CosmicDefenderEnv wraps one headless GameManager behind a Gym-style
+reset()/step() API; VectorCosmicEnv steps many independent worlds in lockstep
+and returns batched NumPy observations, rewards and done flags.
+
+Actions are the game's input bitmask (0-7): INPUT_LEFT | INPUT_RIGHT | INPUT_SHOOT.
+"""
+
+import argparse
+import heapq
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("rl_env needs NumPy for its batched observations: pip install numpy") from None
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import space_shooter as game_module
+
+NUM_ACTIONS = 8
+POWER_UP_TYPES = game_module.POWER_UP_NAMES
+PLAYER_FLAGS = game_module.POWER_UP_ATTRIBUTES
+
+
+class ActionInput:
+    """Input source that returns whatever action the agent chose for this step"""
+
+    def __init__(self):
+        self.bits = 0
+
+    def next_input(self):
+        """Return the current action bitmask"""
+        return self.bits
+
+
+class CosmicDefenderEnv:
+    """Single game world with a Gym-style reset()/step() interface
+
+    Observation layout (float32, normalized to roughly [-1, 1]):
+      player x, lives, time left, 7 power-up flags,
+      max_meteors x (x, y, vx, vy, large) for the lowest meteors on screen,
+      max_bullets x (x, y, vx, vy, kind) for the oldest shots, kind 1/3 bullet,
+      2/3 mega bullet, 1 laser beam,
+      max_power_ups x (x, y, vx, vy, type index, present).
+    Velocities are per frame at the current time-slow factor; a zero kind or
+    present flag marks an empty slot.
+    """
+
+    def __init__(self, seed=None, settings=None, max_meteors=16, max_bullets=16,
+                 max_power_ups=2, life_penalty=100, array_store=False):
+        self.seed = seed
+        self.settings = settings
+        self.max_meteors = max_meteors
+        self.max_bullets = max_bullets
+        self.max_power_ups = max_power_ups
+        self.life_penalty = life_penalty
+        self.array_store = array_store
+        self.observation_size = (3 + len(PLAYER_FLAGS) + max_meteors * 5 + max_bullets * 5
+                                 + max_power_ups * 6)
+        self.action_input = ActionInput()
+        self.game = None
+        self.episodes = 0
+
+    def reset(self, seed=None):
+        """Start a new episode and return its first observation"""
+        if seed is None and self.seed is not None:
+            seed = self.seed + self.episodes
+        self.episodes += 1
+        self.game = game_module.GameManager(headless=True, input_source=self.action_input,
+                                            seed=seed, settings=self.settings,
+                                            array_store=self.array_store)
+        return self.observe()
+
+    def step(self, action):
+        """Apply one action for one frame; return (observation, reward, done, info)"""
+        reward = self.advance(action)
+        game = self.game
+        info = {"score": game.score, "lives": game.player.lives, "frame": game.sim_clock.frame}
+        return self.observe(), float(reward), game.game_over, info
+
+    def advance(self, action):
+        """Step the game with an action and return the reward it earned"""
+        game = self.game
+        score, lives = game.score, game.player.lives
+        self.action_input.bits = int(action)
+        game.step()
+        return (game.score - score) - self.life_penalty * (lives - game.player.lives)
+
+    def observe(self, out=None):
+        """Write the current observation into out (or a new array) and return it"""
+        if out is None:
+            out = np.zeros(self.observation_size, dtype=np.float32)
+        else:
+            out[:] = 0.0
+        game = self.game
+        player = game.player
+        time_slow = 0.3 if player.time_slow else 1.0
+
+        values = [
+            player.x / game_module.SCREEN_WIDTH,
+            player.lives / 3,
+            game.get_remaining_time() / game_module.GAME_DURATION,
+        ]
+        values.extend(1.0 if getattr(player, flag) else 0.0 for flag in PLAYER_FLAGS)
+
+        # The lowest meteors are the most urgent threats
+        for meteor in heapq.nlargest(self.max_meteors, game.meteors, key=meteor_depth):
+            values.extend((
+                meteor.x / game_module.SCREEN_WIDTH,
+                meteor.y / game_module.SCREEN_HEIGHT,
+                meteor.vx * time_slow / 4,
+                meteor.speed * time_slow / 4,
+                1.0 if meteor.size_type == "large" else 0.0,
+            ))
+        values.extend([0.0] * (5 * (self.max_meteors - min(len(game.meteors), self.max_meteors))))
+
+        # Shots in flight, oldest (highest up) first; lasers stand still until they expire
+        bullets = game.bullets[:self.max_bullets]
+        for bullet in bullets:
+            if bullet.continuous:
+                vx = vy = 0.0
+                kind = 1.0
+            else:
+                vx, vy = bullet.vx * time_slow / 10, bullet.vy * time_slow / 10
+                kind = 2 / 3 if bullet.mega else 1 / 3
+            values.extend((
+                bullet.x / game_module.SCREEN_WIDTH,
+                bullet.y / game_module.SCREEN_HEIGHT,
+                vx,
+                vy,
+                kind,
+            ))
+        values.extend([0.0] * (5 * (self.max_bullets - len(bullets))))
+
+        # Power-ups ignore time slow
+        for power_up in game.power_ups[:self.max_power_ups]:
+            values.extend((
+                power_up.x / game_module.SCREEN_WIDTH,
+                power_up.y / game_module.SCREEN_HEIGHT,
+                power_up.vx / 4,
+                power_up.speed / 4,
+                (POWER_UP_TYPES.index(power_up.type) + 1) / len(POWER_UP_TYPES),
+                1.0,
+            ))
+
+        out[:len(values)] = values
+        return out
+
+
+def meteor_depth(meteor):
+    """Sort key: how far a meteor has fallen"""
+    return meteor.y
+
+
+class VectorCosmicEnv:
+    """N independent worlds stepped in lockstep inside one process
+
+    Finished worlds are reset automatically; the final score of the episode
+    that just ended is reported in that world's info dict.
+    """
+
+    def __init__(self, num_envs, seed=0, **env_kwargs):
+        self.envs = [CosmicDefenderEnv(seed=seed + index * 100003, **env_kwargs)
+                     for index in range(num_envs)]
+        self.num_envs = num_envs
+        self.observation_size = self.envs[0].observation_size
+        self.observations = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.total_steps = 0
+        self.step_time = 0.0
+
+    def reset(self):
+        """Reset every world and return the batched observations"""
+        for index, env in enumerate(self.envs):
+            env.reset()
+            env.observe(self.observations[index])
+        return self.observations.copy()
+
+    def step(self, actions):
+        """Step every world with its action; return (observations, rewards, dones, infos)"""
+        start = time.perf_counter()
+        observations, rewards, dones = self.observations, self.rewards, self.dones
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, np.asarray(actions).tolist())):
+            rewards[index] = env.advance(action)
+            game = env.game
+            done = dones[index] = game.game_over
+            info = {"score": game.score, "lives": game.player.lives}
+            if done:
+                env.reset()
+            env.observe(observations[index])
+            infos.append(info)
+
+        self.total_steps += self.num_envs
+        self.step_time += time.perf_counter() - start
+        return observations.copy(), rewards.copy(), dones.copy(), infos
+
+    @property
+    def steps_per_second(self):
+        """Environment steps per second of time spent inside step()"""
+        return self.total_steps / self.step_time if self.step_time else 0.0
+
+
+def main(argv=None):
+    """Measure vectorized environment throughput with random actions"""
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized RL environment")
+    parser.add_argument("--num-envs", type=int, default=256)
+    parser.add_argument("--steps", type=int, default=500, help="vector steps to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--array-store", action="store_true")
+    args = parser.parse_args(argv)
+
+    env = VectorCosmicEnv(args.num_envs, seed=args.seed, array_store=args.array_store)
+    env.reset()
+    rng = np.random.default_rng(args.seed)
+    episodes = 0
+    for _ in range(args.steps):
+        _, _, dones, _ = env.step(rng.integers(0, NUM_ACTIONS, size=args.num_envs))
+        episodes += int(dones.sum())
+    print(f"{env.total_steps} env steps across {args.num_envs} worlds, "
+          f"{episodes} episodes finished: {env.steps_per_second:.0f} env-steps/s")
+
+
+if __name__ == "__main__":
+    main()
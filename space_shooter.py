@@ -5,13 +5,26 @@ A survival-based space shooter where players destroy meteors for points within a
 Features power-ups, lives system, and real-time scoring.
 """
 
+import time
+
+_import_started = time.perf_counter()  # startup instrumentation, see startup_times
+
+import bisect
+import heapq
+import operator
 import pygame
 import random
 import math
-import time
+import struct
+from collections import OrderedDict, deque
 
-# Initialize Pygame
-pygame.init()
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; array-backed entity stores need it
+    np = None
+
+# Milliseconds spent in each startup stage; --startup-times prints them
+startup_times = {}
 
 # Game Constants
 SCREEN_WIDTH = 800
@@ -31,12 +44,389 @@ PURPLE = (128, 0, 128)
 CYAN = (0, 255, 255)
 GRAY = (128, 128, 128)
 
+# Input bitmask shared by keyboard and scripted input sources
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SHOOT = 4
+INPUT_RESTART = 8  # R pressed on the game over screen
+
+
+def record_startup(stage, started):
+    """Store how long a startup stage took since the perf_counter() reading started"""
+    startup_times[stage] = (time.perf_counter() - started) * 1000
+
+
+def init_display():
+    """Start the display and font subsystems; only a rendering GameManager needs them
+    
+    Importing this module initializes nothing, so headless simulations never
+    touch the video or audio drivers; argparse, csv and json are likewise only
+    imported by the command line and profile export code that uses them.
+    """
+    started = time.perf_counter()
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        text_cache.init_fonts()
+    record_startup("display", started)
+
+
+class ScriptedInput:
+    """Input source that plays back a fixed sequence of per-frame input bitmasks"""
+    
+    def __init__(self, frames, loop=True):
+        self.frames = list(frames) or [0]
+        self.loop = loop
+        self.index = 0
+    
+    def next_input(self):
+        """Return the input bitmask for the next frame"""
+        if self.index >= len(self.frames):
+            if not self.loop:
+                return 0
+            self.index = 0
+        bits = self.frames[self.index]
+        self.index += 1
+        return bits
+
+
+class RandomInput:
+    """Input source that holds random actions for a few frames at a time"""
+    
+    def __init__(self, seed=None, shoot_chance=0.8, hold_frames=15):
+        self.rng = random.Random(seed)
+        self.shoot_chance = shoot_chance
+        self.hold_frames = hold_frames
+        self.bits = 0
+        self.frames_left = 0
+    
+    def next_input(self):
+        """Return the input bitmask for the next frame"""
+        if self.frames_left <= 0:
+            self.bits = self.rng.choice([0, INPUT_LEFT, INPUT_RIGHT])
+            if self.rng.random() < self.shoot_chance:
+                self.bits |= INPUT_SHOOT
+            self.frames_left = self.hold_frames
+        self.frames_left -= 1
+        return self.bits
+
+
+class SimClock:
+    """Fixed-timestep game clock; all game timers are measured on it in milliseconds"""
+    
+    def __init__(self, dt=1000 / FPS):
+        self.dt = dt
+        self.frame = 0
+    
+    @property
+    def now(self):
+        """Current game time in milliseconds"""
+        return self.frame * self.dt
+    
+    def advance(self, steps=1):
+        """Advance game time by a number of fixed steps"""
+        self.frame += steps
+        return self.now
+
+
+# Binary snapshot records shared by the entity classes (see GameManager.snapshot)
+COUNT = struct.Struct("<I")
+NUMBER = struct.Struct("<d")
+EVENT_COUNT = struct.Struct("<Iq")  # pending events, next sequence number
+EVENT = struct.Struct("<qbqB")  # frame, order, sequence, argument count
+RNG_STATE = struct.Struct("<625I?d")  # Mersenne Twister words and position, cached gauss
+
+
+def pack_text(out, text):
+    """Append a short length-prefixed UTF-8 string to a snapshot buffer"""
+    encoded = text.encode()
+    out.append(len(encoded))
+    out += encoded
+
+
+def unpack_text(data, offset):
+    """Read a string written by pack_text; return (text, next offset)"""
+    end = offset + 1 + data[offset]
+    return bytes(data[offset + 1:end]).decode(), end
+
+
+class TimerScheduler:
+    """Min-heap of game events keyed by the frame they fall due on
+    
+    Events are plain data - a kind string and a tuple of arguments - so the
+    queue can be packed into snapshots. Each frame pays only for the events
+    that are due; nothing is polled.
+    """
+    
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []
+        self.sequence = 0
+    
+    def frame_after(self, start, delay):
+        """Return the first frame whose time is strictly more than delay after start"""
+        clock = self.clock
+        frame = max(0, int((start + delay) / clock.dt) - 1)
+        while frame * clock.dt - start <= delay:
+            frame += 1
+        return frame
+    
+    def schedule(self, frame, kind, *data, order=0):
+        """Queue an event; events due on the same frame run by order, then FIFO"""
+        heapq.heappush(self.heap, (frame, order, self.sequence, kind, data))
+        self.sequence += 1
+    
+    def schedule_after(self, start, delay, kind, *data, order=0):
+        """Queue an event for once more than delay milliseconds have passed since start"""
+        self.schedule(self.frame_after(start, delay), kind, *data, order=order)
+    
+    def pop_due(self):
+        """Yield (kind, data) for every event due on or before the current frame"""
+        heap = self.heap
+        frame = self.clock.frame
+        while heap and heap[0][0] <= frame:
+            event = heapq.heappop(heap)
+            yield event[3], event[4]
+    
+    def clear(self):
+        """Drop every pending event"""
+        self.heap.clear()
+    
+    def pack_state(self, out):
+        """Append the queue, in heap order, to a snapshot buffer"""
+        out += EVENT_COUNT.pack(len(self.heap), self.sequence)
+        for frame, order, sequence, kind, data in self.heap:
+            out += EVENT.pack(frame, order, sequence, len(data))
+            pack_text(out, kind)
+            for value in data:
+                if isinstance(value, str):
+                    out.append(0)
+                    pack_text(out, value)
+                else:
+                    out.append(1)
+                    out += NUMBER.pack(value)
+    
+    def unpack_state(self, data, offset):
+        """Replace the queue with one read by pack_state; return the next offset"""
+        count, self.sequence = EVENT_COUNT.unpack_from(data, offset)
+        offset += EVENT_COUNT.size
+        heap = self.heap
+        heap.clear()
+        for _ in range(count):
+            frame, order, sequence, values = EVENT.unpack_from(data, offset)
+            kind, offset = unpack_text(data, offset + EVENT.size)
+            items = []
+            for _ in range(values):
+                if data[offset] == 0:
+                    value, offset = unpack_text(data, offset + 1)
+                else:
+                    (value,) = NUMBER.unpack_from(data, offset + 1)
+                    offset += 1 + NUMBER.size
+                items.append(value)
+            heap.append((frame, order, sequence, kind, tuple(items)))
+        return offset
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, string, colour)"""
+    
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_font(self, name=None, size=36):
+        """Return a shared font instance, loading it on first use"""
+        if not pygame.font.get_init():
+            self.init_fonts()  # offscreen rendering without a window, or after pygame.quit()
+        font = self.fonts.get((name, size))
+        if font is None:
+            font = self.fonts[(name, size)] = pygame.font.Font(name, size)
+        return font
+    
+    def init_fonts(self):
+        """Start the font module, dropping fonts and text from any earlier font session
+        
+        pygame.quit() frees every Font, so using one cached before it crashes
+        the interpreter once the font module is started again.
+        """
+        pygame.font.init()
+        self.fonts.clear()
+        self.entries.clear()
+    
+    def render(self, text, color, size=36, name=None):
+        """Return the rendered surface for a string, rendering it only on a cache miss"""
+        key = (name, size, text, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = self.get_font(name, size).render(text, True, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+    
+    def stats(self):
+        """Return hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+# Shared by the HUD and power-up labels
+text_cache = TextCache()
+
+# Visual detail per quality level, each level adding one cut to the one above:
+# (draw every Nth particle, laser glow layers, meteor angle stride, pulsing power-up glow)
+QUALITY_LEVELS = [
+    (1, True, 1, True),
+    (2, True, 1, True),
+    (2, False, 1, True),
+    (2, False, 3, True),
+    (2, False, 3, False),
+]
+
+
+class RenderQuality:
+    """Visual detail switches read by the draw methods; never affects the simulation"""
+    
+    def __init__(self):
+        self.set_level(0)
+    
+    def set_level(self, level):
+        """Apply one row of QUALITY_LEVELS"""
+        self.level = level
+        (self.particle_stride, self.laser_glow,
+         self.meteor_angle_stride, self.pulse_power_ups) = QUALITY_LEVELS[level]
+
+render_quality = RenderQuality()
+
+# Every power-up: (player attribute, duration in milliseconds, colour, HUD label)
+POWER_UP_TYPES = {
+    "rapid_fire": ("rapid_fire", 5000, RED, "RAPID FIRE"),
+    "shield": ("invincible", 5000, CYAN, "SHIELD"),
+    "double_score": ("double_score", 5000, GREEN, "DOUBLE SCORE"),
+    "triple_shot": ("triple_shot", 7000, PURPLE, "TRIPLE SHOT"),
+    "laser_beam": ("laser_beam", 4000, (255, 0, 255), "LASER BEAM"),
+    "time_slow": ("time_slow", 6000, (0, 255, 255), "TIME SLOW"),
+    "mega_bullets": ("mega_bullets", 5000, ORANGE, "MEGA BULLETS"),
+}
+POWER_UP_NAMES = list(POWER_UP_TYPES)
+POWER_UP_ATTRIBUTES = [info[0] for info in POWER_UP_TYPES.values()]
+
+# Tunable gameplay settings; GameManager(settings=...) overrides them per game
+POWER_UP_DURATIONS = {name: info[1] for name, info in POWER_UP_TYPES.items()}
+METEOR_SPEED_RANGES = {  # pixels per frame
+    "large": (1, 3),
+    "small": (2, 4),
+}
+DEFAULT_SETTINGS = {
+    "meteor_spawn_rate": 1000,  # initial milliseconds between waves
+    "power_up_durations": POWER_UP_DURATIONS,
+    "meteor_speed_ranges": METEOR_SPEED_RANGES,
+}
+
+# Removal predicates used when compacting entity lists
+OFF_SCREEN = operator.methodcaller("is_off_screen")
+FINISHED = operator.methodcaller("is_finished")
+
+# Entities preallocated per pool; raise these for the heaviest waves
+DEFAULT_POOL_SIZES = {
+    "meteors": 64,
+    "bullets": 128,
+    "lasers": 8,
+    "power_ups": 4,
+    "explosions": 32,
+}
+
+# Default headless script: sweep across the screen while firing
+SWEEP_SCRIPT = [INPUT_LEFT | INPUT_SHOOT] * 60 + [INPUT_RIGHT | INPUT_SHOOT] * 60
+
+
+def is_number(value):
+    """True for ints and floats, but not for bools"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def setting_problem(name, value, default):
+    """Describe how an override's shape differs from its default value, or return None"""
+    if isinstance(default, tuple):
+        if (not isinstance(value, (tuple, list)) or len(value) != len(default)
+                or not all(is_number(item) for item in value)):
+            return f"{name} must be a (min, max) pair of numbers, not {value!r}"
+    elif not is_number(value):
+        return f"{name} must be a number, not {value!r}"
+    return None
+
+
+def merge_settings(overrides=None):
+    """Return DEFAULT_SETTINGS with per-game overrides applied; nested tables are merged key by key
+    
+    Raises ValueError naming every unknown setting, nested ones as dotted names,
+    and every value shaped differently from its default: a table, a (min, max)
+    pair or a number.
+    """
+    settings = {}
+    overrides = overrides or {}
+    unknown = set(overrides) - set(DEFAULT_SETTINGS)
+    problems = []
+    for name, value in overrides.items():
+        if name in unknown:
+            continue
+        default = DEFAULT_SETTINGS[name]
+        if not isinstance(default, dict):
+            problems.append(setting_problem(name, value, default))
+        elif not isinstance(value, dict):
+            problems.append(f"{name} must be a table of {', '.join(default)}, not {value!r}")
+        else:
+            unknown.update(f"{name}.{key}" for key in set(value) - set(default))
+            problems.extend(setting_problem(f"{name}.{key}", item, default[key])
+                            for key, item in value.items() if key in default)
+    problems = [problem for problem in problems if problem is not None]
+    if unknown:
+        problems.insert(0, f"Unknown game settings: {', '.join(sorted(unknown))}")
+    if problems:
+        raise ValueError("; ".join(problems))
+    for name, default in DEFAULT_SETTINGS.items():
+        value = overrides.get(name, default)
+        if isinstance(default, dict):
+            value = dict(default, **value)
+        settings[name] = value
+    return settings
+
+
 class Player:
     """Player spaceship class handling movement, shooting, and collision detection"""
     
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "clock", "width", "height", "speed", "lives",
+                 "invincible", "invincible_timer", "rapid_fire", "rapid_fire_timer",
+                 "double_score", "double_score_timer", "triple_shot", "triple_shot_timer",
+                 "laser_beam", "laser_beam_timer", "time_slow", "time_slow_timer",
+                 "mega_bullets", "mega_bullets_timer", "last_shot", "shot_cooldown",
+                 "make_bullet", "make_laser")
+    
+    # x, y, lives, one flag and one timer per power-up, last shot time
+    SNAPSHOT = struct.Struct(f"<ddi{len(POWER_UP_ATTRIBUTES)}?{len(POWER_UP_ATTRIBUTES)}dd")
+    STATE_NAMES = (["x", "y", "lives"] + POWER_UP_ATTRIBUTES
+                   + [attribute + "_timer" for attribute in POWER_UP_ATTRIBUTES] + ["last_shot"])
+    state_getter = operator.attrgetter(*STATE_NAMES)
+    
+    def __init__(self, x, y, clock=None):
         self.x = x
         self.y = y
+        self.clock = clock if clock is not None else SimClock()
         self.width = 40
         self.height = 30
         self.speed = 5
@@ -58,42 +448,20 @@ class Player:
         self.last_shot = 0
         self.shot_cooldown = 250  # milliseconds
         
-    def update(self):
-        """Update player state including power-up timers"""
-        current_time = pygame.time.get_ticks()
-        
-        # Update power-up timers
-        if self.invincible and current_time - self.invincible_timer > 5000:
-            self.invincible = False
-            
-        if self.rapid_fire and current_time - self.rapid_fire_timer > 5000:
-            self.rapid_fire = False
-            
-        if self.double_score and current_time - self.double_score_timer > 5000:
-            self.double_score = False
-            
-        if self.triple_shot and current_time - self.triple_shot_timer > 7000:
-            self.triple_shot = False
-            
-        if self.laser_beam and current_time - self.laser_beam_timer > 4000:
-            self.laser_beam = False
-            
-        if self.time_slow and current_time - self.time_slow_timer > 6000:
-            self.time_slow = False
-            
-        if self.mega_bullets and current_time - self.mega_bullets_timer > 5000:
-            self.mega_bullets = False
+        # Projectile constructors, replaced by GameManager with pooled allocators
+        self.make_bullet = Bullet
+        self.make_laser = LaserBeam
     
-    def move(self, direction):
-        """Move player left or right within screen bounds"""
+    def move(self, direction, scale=1.0):
+        """Move player left or right within screen bounds; scale is the step length in 60 Hz frames"""
         if direction == "left" and self.x > 0:
-            self.x -= self.speed
+            self.x -= self.speed * scale
         elif direction == "right" and self.x < SCREEN_WIDTH - self.width:
-            self.x += self.speed
+            self.x += self.speed * scale
     
     def shoot(self):
         """Create bullets based on current power-ups"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.now
         cooldown = 100 if self.rapid_fire else self.shot_cooldown
         
         if current_time - self.last_shot > cooldown:
@@ -102,47 +470,84 @@ class Player:
             
             if self.laser_beam:
                 # Create laser beam (continuous beam)
-                bullets.append(LaserBeam(self.x + self.width // 2, self.y))
+                bullets.append(self.make_laser(self.x + self.width // 2, self.y, self.clock))
             elif self.triple_shot:
                 # Create three bullets
-                bullets.append(Bullet(self.x + self.width // 2, self.y, angle=0, mega=self.mega_bullets))
-                bullets.append(Bullet(self.x + self.width // 2 - 10, self.y, angle=-15, mega=self.mega_bullets))
-                bullets.append(Bullet(self.x + self.width // 2 + 10, self.y, angle=15, mega=self.mega_bullets))
+                bullets.append(self.make_bullet(self.x + self.width // 2, self.y, angle=0, mega=self.mega_bullets))
+                bullets.append(self.make_bullet(self.x + self.width // 2 - 10, self.y, angle=-15, mega=self.mega_bullets))
+                bullets.append(self.make_bullet(self.x + self.width // 2 + 10, self.y, angle=15, mega=self.mega_bullets))
             else:
                 # Single bullet
-                bullets.append(Bullet(self.x + self.width // 2, self.y, mega=self.mega_bullets))
+                bullets.append(self.make_bullet(self.x + self.width // 2, self.y, mega=self.mega_bullets))
             
             return bullets
         return []
     
+    def pack_state(self, out):
+        """Append position, lives and power-up state to a snapshot buffer"""
+        out += self.SNAPSHOT.pack(*self.state_getter(self))
+    
+    def unpack_state(self, data, offset):
+        """Restore the state written by pack_state; return the next offset"""
+        for name, value in zip(self.STATE_NAMES, self.SNAPSHOT.unpack_from(data, offset)):
+            setattr(self, name, value)
+        return offset + self.SNAPSHOT.size
+    
     def get_rect(self):
         """Return collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
-    def draw(self, screen):
-        """Draw the player spaceship"""
+    def get_draw_rect(self):
+        """Return the screen area the ship, engine glow and shield can cover"""
+        return pygame.Rect(self.x + self.width // 2 - 31, self.y + self.height // 2 - 31, 63, 63)
+    
+    def add_blits(self, blits):
+        """Append the ship and, while invincible, its shield to a frame's blit list"""
+        blits.append(sprite_atlas.place("ship", self.x, self.y))
+        if self.invincible:
+            blits.append(sprite_atlas.place("shield", self.x + self.width // 2, self.y + self.height // 2))
+    
+    @staticmethod
+    def render_ship(width=40, height=30):
+        """Render the ship body and engine glow onto a new surface"""
+        surface = pygame.Surface((width + 1, height + 3), pygame.SRCALPHA)
+        
         # Main body (blue triangle)
         points = [
-            (self.x + self.width // 2, self.y),  # Top point
-            (self.x, self.y + self.height),      # Bottom left
-            (self.x + self.width, self.y + self.height)  # Bottom right
+            (width // 2, 0),  # Top point
+            (0, height),      # Bottom left
+            (width, height)   # Bottom right
         ]
-        pygame.draw.polygon(screen, BLUE, points)
+        pygame.draw.polygon(surface, BLUE, points)
         
         # Engine glow (orange rectangle at bottom)
-        engine_rect = pygame.Rect(self.x + 10, self.y + self.height - 5, self.width - 20, 8)
-        pygame.draw.rect(screen, ORANGE, engine_rect)
-        
-        # Shield effect if invincible
-        if self.invincible:
-            pygame.draw.circle(screen, CYAN, 
-                             (self.x + self.width // 2, self.y + self.height // 2), 
-                             30, 3)
+        pygame.draw.rect(surface, ORANGE, (10, height - 5, width - 20, 8))
+        return surface
+    
+    @staticmethod
+    def render_shield(radius=30):
+        """Render the shield ring, centred on (radius, radius)"""
+        surface = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, CYAN, (radius, radius), radius, 3)
+        return surface
 
 class Meteor:
     """Meteor class for falling obstacles"""
     
-    def __init__(self, x, y, size_type="large"):
+    __slots__ = ("x", "y", "size_type", "width", "height", "speed", "points",
+                 "rotation", "rotation_speed", "rng", "speed_ranges")
+    
+    vx = 0.0  # meteors fall straight down at self.speed
+    
+    SNAPSHOT = struct.Struct("<ddddd?")  # x, y, speed, rotation, rotation speed, large
+    
+    def __init__(self, x, y, size_type="large", rng=None, speed_ranges=None):
+        self.rng = rng if rng is not None else random
+        self.speed_ranges = speed_ranges if speed_ranges is not None else METEOR_SPEED_RANGES
+        self.reset(x, y, size_type)
+    
+    def reset(self, x, y, size_type="large"):
+        """Initialize (or reinitialize a pooled) meteor"""
         self.x = x
         self.y = y
         self.size_type = size_type
@@ -150,20 +555,38 @@ class Meteor:
         if size_type == "large":
             self.width = 40
             self.height = 40
-            self.speed = random.uniform(1, 3)
+            self.speed = self.rng.uniform(*self.speed_ranges["large"])
             self.points = 10
         else:  # small
             self.width = 20
             self.height = 20
-            self.speed = random.uniform(2, 4)
+            self.speed = self.rng.uniform(*self.speed_ranges["small"])
             self.points = 10
             
         self.rotation = 0
-        self.rotation_speed = random.uniform(-5, 5)
+        self.rotation_speed = self.rng.uniform(-5, 5)
+    
+    def pack_state(self, out):
+        """Append the meteor to a snapshot buffer"""
+        out += self.SNAPSHOT.pack(self.x, self.y, self.speed, self.rotation, self.rotation_speed,
+                                  self.size_type == "large")
     
-    def update(self, time_slow=False):
+    def unpack_state(self, data, offset):
+        """Restore a meteor written by pack_state; return the next offset"""
+        x, y, speed, rotation, rotation_speed, large = self.SNAPSHOT.unpack_from(data, offset)
+        self.x = x
+        self.y = y
+        self.size_type = "large" if large else "small"
+        self.width = self.height = 40 if large else 20
+        self.speed = speed
+        self.points = 10
+        self.rotation = rotation
+        self.rotation_speed = rotation_speed
+        return offset + self.SNAPSHOT.size
+    
+    def update(self, time_slow=False, scale=1.0):
         """Update meteor position and rotation"""
-        speed_multiplier = 0.3 if time_slow else 1.0
+        speed_multiplier = (0.3 if time_slow else 1.0) * scale
         self.y += self.speed * speed_multiplier
         self.rotation += self.rotation_speed * speed_multiplier
     
@@ -171,50 +594,190 @@ class Meteor:
         """Return collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_draw_rect(self):
+        """Return the screen area the rotated sprite can cover"""
+        size = int(max(self.width, self.height) * 1.42) + 2
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = (self.x + self.width // 2, self.y + self.height // 2)
+        return rect
+    
     def is_off_screen(self):
         """Check if meteor has fallen off screen"""
         return self.y > SCREEN_HEIGHT
     
-    def draw(self, screen):
-        """Draw the meteor with rotation effect"""
-        # Create a surface for the meteor
-        meteor_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+    @staticmethod
+    def render_shape(size_type, width, height):
+        """Render the unrotated meteor polygon onto a new surface"""
+        meteor_surface = pygame.Surface((width, height), pygame.SRCALPHA)
         
         # Draw meteor shape (irregular polygon)
-        if self.size_type == "large":
+        if size_type == "large":
             color = GRAY
             # Large meteor - more irregular shape
             points = [
-                (self.width * 0.5, 0),
-                (self.width * 0.8, self.height * 0.3),
-                (self.width, self.height * 0.7),
-                (self.width * 0.6, self.height),
-                (self.width * 0.2, self.height * 0.8),
-                (0, self.height * 0.4)
+                (width * 0.5, 0),
+                (width * 0.8, height * 0.3),
+                (width, height * 0.7),
+                (width * 0.6, height),
+                (width * 0.2, height * 0.8),
+                (0, height * 0.4)
             ]
         else:
             color = (160, 160, 160)
             # Small meteor - simpler shape
             points = [
-                (self.width * 0.5, 0),
-                (self.width, self.height * 0.4),
-                (self.width * 0.7, self.height),
-                (self.width * 0.3, self.height),
-                (0, self.height * 0.6)
+                (width * 0.5, 0),
+                (width, height * 0.4),
+                (width * 0.7, height),
+                (width * 0.3, height),
+                (0, height * 0.6)
             ]
         
         pygame.draw.polygon(meteor_surface, color, points)
-        
-        # Rotate the surface
-        rotated_surface = pygame.transform.rotate(meteor_surface, self.rotation)
+        return meteor_surface
+    
+    def add_blits(self, blits):
+        """Append the meteor's pre-rotated sprite to a frame's blit list"""
+        rotated_surface = meteor_sprites.get(self.size_type, self.width, self.height, self.rotation)
         rotated_rect = rotated_surface.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
+        blits.append((rotated_surface, rotated_rect))
+
+class MeteorSpriteCache:
+    """Pre-rotated meteor sprites keyed by (size_type, quantized rotation angle)"""
+    
+    def __init__(self, angle_steps=72):
+        self.angle_steps = angle_steps
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+        self.memory_bytes = 0
+    
+    def set_angle_steps(self, angle_steps):
+        """Change the angle resolution, dropping sprites rendered at the old one"""
+        self.angle_steps = angle_steps
+        self.clear()
+    
+    def clear(self):
+        """Drop every cached sprite and reset the counters"""
+        self.sprites.clear()
+        self.hits = 0
+        self.misses = 0
+        self.memory_bytes = 0
+    
+    def get(self, size_type, width, height, rotation):
+        """Return the sprite for the nearest cached rotation, rendering it on first use"""
+        stride = render_quality.meteor_angle_stride
+        step = round(rotation * self.angle_steps / 360 / stride) * stride % self.angle_steps
+        key = (size_type, step)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+        
+        self.misses += 1
+        base = Meteor.render_shape(size_type, width, height)
+        sprite = pygame.transform.rotate(base, step * 360 / self.angle_steps)
+        self.sprites[key] = sprite
+        self.memory_bytes += sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+        return sprite
+    
+    def prerender(self, sizes=(("large", 40, 40), ("small", 20, 20))):
+        """Render every rotation up front so no sprite is built during play"""
+        started = time.perf_counter()
+        for size_type, width, height in sizes:
+            for step in range(self.angle_steps):
+                self.get(size_type, width, height, step * 360 / self.angle_steps)
+        record_startup("meteor sprites", started)
+    
+    def stats(self):
+        """Return hit/miss and memory counters"""
+        lookups = self.hits + self.misses
+        return {
+            "angle_steps": self.angle_steps,
+            "sprites": len(self.sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_bytes": self.memory_bytes,
+        }
+
+# Shared by every meteor; the angle resolution is set from the command line
+meteor_sprites = MeteorSpriteCache()
+
+
+class SpriteAtlas:
+    """Every static sprite packed into one Surface, so a frame is drawn with one blits() call
+    
+    Entries map a key to the sprite's area in the atlas and the offset of its
+    corner from the point it is anchored at. The atlas is built at startup or
+    on first use.
+    """
+    
+    WIDTH = 512
+    
+    def __init__(self):
+        self.surface = None
+        self.entries = {}
+    
+    @staticmethod
+    def static_sprites():
+        """Yield (key, surface, anchor point) for every sprite that never changes"""
+        yield "ship", Player.render_ship(), (0, 0)
+        yield "shield", Player.render_shield(30), (30, 30)
+        for mega in (False, True):
+            yield ("bullet", mega), Bullet.render_sprite(mega), (0, 0)
+        for power_type in POWER_UP_NAMES:
+            for radius in PowerUp.GLOW_RADII:
+                yield ("power_up", power_type, radius), PowerUp.render_sprite(power_type, radius), (radius, radius)
+        for filled in (True, False):
+            yield ("heart", filled), HudLayer.render_heart(filled), (0, 0)
+    
+    def build(self):
+        """Render every static sprite and pack them into shelves of the atlas"""
+        sprites = sorted(self.static_sprites(), key=lambda sprite: -sprite[1].get_height())
+        x = y = shelf_height = 0
+        placed = []
+        for key, surface, anchor in sprites:
+            width, height = surface.get_size()
+            if x + width > self.WIDTH:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            placed.append((key, surface, anchor, pygame.Rect(x, y, width, height)))
+            x += width
+            shelf_height = max(shelf_height, height)
         
-        screen.blit(rotated_surface, rotated_rect)
+        atlas = pygame.Surface((self.WIDTH, y + shelf_height), pygame.SRCALPHA)
+        for key, surface, (anchor_x, anchor_y), area in placed:
+            atlas.blit(surface, area)
+            self.entries[key] = (area, -anchor_x, -anchor_y)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        self.surface = atlas
+        return self
+    
+    def place(self, key, x, y):
+        """Return the (source, dest, area) blit that draws a sprite anchored at (x, y)"""
+        if self.surface is None:
+            self.build()
+        area, offset_x, offset_y = self.entries[key]
+        return self.surface, (x + offset_x, y + offset_y), area
+
+# Ship, shield, bullets, power-up capsules and hearts
+sprite_atlas = SpriteAtlas()
 
 class Bullet:
     """Bullet class for player projectiles"""
     
+    continuous = False  # destroyed by its first hit
+    
+    __slots__ = ("x", "y", "angle", "mega", "width", "height", "speed", "damage", "vx", "vy")
+    
+    SNAPSHOT = struct.Struct("<ddd?")  # x, y, angle, mega
+    
     def __init__(self, x, y, angle=0, mega=False):
+        self.reset(x, y, angle, mega)
+    
+    def reset(self, x, y, angle=0, mega=False):
+        """Initialize (or reinitialize a pooled) bullet"""
         self.x = x
         self.y = y
         self.angle = angle
@@ -235,9 +798,18 @@ class Bullet:
         self.vx = math.sin(math.radians(angle)) * self.speed
         self.vy = -math.cos(math.radians(angle)) * self.speed
     
-    def update(self, time_slow=False):
+    def pack_state(self, out):
+        """Append the bullet to a snapshot buffer; velocity follows from angle and size"""
+        out += self.SNAPSHOT.pack(self.x, self.y, self.angle, self.mega)
+    
+    def unpack_state(self, data, offset):
+        """Restore a bullet written by pack_state; return the next offset"""
+        self.reset(*self.SNAPSHOT.unpack_from(data, offset))
+        return offset + self.SNAPSHOT.size
+    
+    def update(self, time_slow=False, scale=1.0):
         """Update bullet position"""
-        speed_multiplier = 0.3 if time_slow else 1.0
+        speed_multiplier = (0.3 if time_slow else 1.0) * scale
         self.x += self.vx * speed_multiplier
         self.y += self.vy * speed_multiplier
     
@@ -245,34 +817,71 @@ class Bullet:
         """Return collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_draw_rect(self):
+        """Return the screen area the bullet covers"""
+        return pygame.Rect(self.x - 1, self.y - 1, self.width + 2, self.height + 2)
+    
     def is_off_screen(self):
         """Check if bullet has left screen"""
         return self.y < 0 or self.x < 0 or self.x > SCREEN_WIDTH
     
-    def draw(self, screen):
-        """Draw the bullet"""
-        if self.mega:
+    def add_blits(self, blits):
+        """Append the bullet's atlas sprite to a frame's blit list"""
+        blits.append(sprite_atlas.place(("bullet", self.mega), self.x, self.y))
+    
+    @staticmethod
+    def render_sprite(mega):
+        """Render a normal or mega bullet onto a new surface"""
+        if mega:
             # Mega bullet - larger with glow effect
-            pygame.draw.rect(screen, ORANGE, (self.x, self.y, self.width, self.height))
-            pygame.draw.rect(screen, YELLOW, (self.x + 1, self.y + 1, self.width - 2, self.height - 2))
+            surface = pygame.Surface((8, 16), pygame.SRCALPHA)
+            surface.fill(ORANGE)
+            surface.fill(YELLOW, (1, 1, 6, 14))
         else:
             # Normal bullet
-            pygame.draw.rect(screen, YELLOW, (self.x, self.y, self.width, self.height))
+            surface = pygame.Surface((4, 10), pygame.SRCALPHA)
+            surface.fill(YELLOW)
+        return surface
 
 class LaserBeam:
     """Laser beam class for continuous damage"""
     
-    def __init__(self, x, y):
+    continuous = True  # damages every meteor in its column until it expires
+    glow_sprites = {}  # (beam length, width) -> [(glow surface, x offset)], shared by all beams
+    beam_sprites = {}  # (beam length, width) -> beam surface
+    
+    __slots__ = ("x", "y", "clock", "width", "height", "speed", "damage",
+                 "lifetime", "created_time")
+    
+    SNAPSHOT = struct.Struct("<ddd")  # x, y, created time
+    
+    def __init__(self, x, y, clock):
+        self.reset(x, y, clock)
+    
+    def reset(self, x, y, clock):
+        """Initialize (or reinitialize a pooled) laser beam"""
         self.x = x
         self.y = y
+        self.clock = clock
         self.width = 6
         self.height = SCREEN_HEIGHT
         self.speed = 0  # Laser doesn't move
         self.damage = 5
         self.lifetime = 200  # milliseconds
-        self.created_time = pygame.time.get_ticks()
+        self.created_time = clock.now
+    
+    def pack_state(self, out):
+        """Append the beam to a snapshot buffer"""
+        out += self.SNAPSHOT.pack(self.x, self.y, self.created_time)
+    
+    def unpack_state(self, data, offset):
+        """Restore a beam written by pack_state on its pool-bound clock; return the next offset"""
+        x, y, created_time = self.SNAPSHOT.unpack_from(data, offset)
+        self.reset(x, y, self.clock)
+        self.created_time = created_time
+        return offset + self.SNAPSHOT.size
         
-    def update(self, time_slow=False):
+    def update(self, time_slow=False, scale=1.0):
         """Laser beam doesn't move, just tracks lifetime"""
         pass
     
@@ -280,116 +889,182 @@ class LaserBeam:
         """Return collision rectangle"""
         return pygame.Rect(self.x - self.width // 2, 0, self.width, self.y)
     
+    def get_draw_rect(self):
+        """Return the screen area the beam and its widest glow layer cover"""
+        glow_width = self.width + 8
+        return pygame.Rect(self.x - glow_width // 2 - 1, 0, glow_width + 2, self.y)
+    
     def is_off_screen(self):
         """Check if laser beam should be removed"""
-        return pygame.time.get_ticks() - self.created_time > self.lifetime
-    
-    def draw(self, screen):
-        """Draw the laser beam"""
-        # Main laser beam
-        pygame.draw.rect(screen, RED, (self.x - self.width // 2, 0, self.width, self.y))
-        # Inner bright core
-        pygame.draw.rect(screen, WHITE, (self.x - 2, 0, 4, self.y))
+        return self.clock.now - self.created_time > self.lifetime
+    
+    def add_blits(self, blits):
+        """Append the beam and its glow layers to a frame's blit list"""
+        length = int(self.y)
+        blits.append((self.get_beam(length, self.width), (self.x - self.width // 2, 0)))
         # Outer glow effect
-        for i in range(3):
-            alpha = 50 - i * 15
-            glow_surface = pygame.Surface((self.width + i * 4, self.y))
-            glow_surface.set_alpha(alpha)
-            glow_surface.fill(RED)
-            screen.blit(glow_surface, (self.x - (self.width + i * 4) // 2, 0))
+        if render_quality.laser_glow:
+            for glow_surface, offset in self.get_glow(length, self.width):
+                blits.append((glow_surface, (self.x - offset, 0)))
+    
+    @classmethod
+    def get_beam(cls, length, width=6):
+        """Return the pre-built beam, with its bright core, for this length"""
+        beam = cls.beam_sprites.get((length, width))
+        if beam is None:
+            # Main laser beam with an inner bright core
+            beam = pygame.Surface((width, max(1, length)))
+            beam.fill(RED)
+            beam.fill(WHITE, (width // 2 - 2, 0, 4, length))
+            cls.beam_sprites[(length, width)] = beam
+        return beam
+    
+    @classmethod
+    def get_glow(cls, length, width=6):
+        """Return the pre-built glow layers for a beam of this length"""
+        layers = cls.glow_sprites.get((length, width))
+        if layers is None:
+            layers = []
+            for i in range(3):
+                glow_surface = pygame.Surface((width + i * 4, max(1, length)))
+                glow_surface.set_alpha(50 - i * 15)
+                glow_surface.fill(RED)
+                layers.append((glow_surface, (width + i * 4) // 2))
+            cls.glow_sprites[(length, width)] = layers
+        return layers
 
 class PowerUp:
     """Power-up class for special abilities"""
     
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "width", "height", "speed", "type", "glow_timer", "color", "rng")
+    
+    vx = 0.0  # power-ups fall straight down at self.speed
+    
+    GLOW_RADII = range(12 + 5, 12 + 16)  # capsule half-width plus every whole glow intensity
+    
+    SNAPSHOT = struct.Struct("<ddBd")  # x, y, type index, glow timer
+    
+    def __init__(self, x, y, rng=None):
+        self.rng = rng if rng is not None else random
+        self.reset(x, y)
+    
+    def reset(self, x, y):
+        """Initialize (or reinitialize a pooled) power-up"""
         self.x = x
         self.y = y
         self.width = 25
         self.height = 25
         self.speed = 2
-        self.type = random.choice([
-            "rapid_fire", "shield", "double_score", 
-            "triple_shot", "laser_beam", "time_slow", "mega_bullets"
-        ])
+        self.type = self.rng.choice(POWER_UP_NAMES)
         self.glow_timer = 0
-        
-        # Set color based on type
-        color_map = {
-            "rapid_fire": RED,
-            "shield": CYAN,
-            "double_score": GREEN,
-            "triple_shot": PURPLE,
-            "laser_beam": (255, 0, 255),  # Magenta
-            "time_slow": (0, 255, 255),   # Bright cyan
-            "mega_bullets": ORANGE
-        }
-        self.color = color_map.get(self.type, WHITE)
+        self.color = POWER_UP_TYPES[self.type][2]
+    
+    def pack_state(self, out):
+        """Append the power-up to a snapshot buffer"""
+        out += self.SNAPSHOT.pack(self.x, self.y, POWER_UP_NAMES.index(self.type), self.glow_timer)
+    
+    def unpack_state(self, data, offset):
+        """Restore a power-up written by pack_state; return the next offset"""
+        x, y, type_index, self.glow_timer = self.SNAPSHOT.unpack_from(data, offset)
+        self.x = x
+        self.y = y
+        self.width = 25
+        self.height = 25
+        self.speed = 2
+        self.type = POWER_UP_NAMES[type_index]
+        self.color = POWER_UP_TYPES[self.type][2]
+        return offset + self.SNAPSHOT.size
     
-    def update(self):
+    def update(self, scale=1.0):
         """Update power-up position and glow effect"""
-        self.y += self.speed
-        self.glow_timer += 1
+        self.y += self.speed * scale
+        self.glow_timer += scale
     
     def get_rect(self):
         """Return collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_draw_rect(self):
+        """Return the screen area the capsule and its largest glow can cover"""
+        radius = self.width // 2 + 16
+        return pygame.Rect(self.x + self.width // 2 - radius, self.y + self.height // 2 - radius,
+                           radius * 2, radius * 2)
+    
     def is_off_screen(self):
         """Check if power-up has fallen off screen"""
         return self.y > SCREEN_HEIGHT
     
-    def draw(self, screen):
-        """Draw the power-up with glowing effect"""
+    def add_blits(self, blits):
+        """Append the capsule sprite for the current glow phase to a frame's blit list"""
         # Pulsing glow effect
-        glow_intensity = abs(math.sin(self.glow_timer * 0.2)) * 10 + 5
+        if render_quality.pulse_power_ups:
+            glow_intensity = abs(math.sin(self.glow_timer * 0.2)) * 10 + 5
+        else:
+            glow_intensity = 10
+        radius = self.width // 2 + int(glow_intensity)
+        blits.append(sprite_atlas.place(("power_up", self.type, radius),
+                                        self.x + self.width // 2, self.y + self.height // 2))
+    
+    @staticmethod
+    def render_sprite(power_type, radius, size=25):
+        """Render a capsule, its type icon and a glow of this radius, centred on (radius, radius)"""
+        surface = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+        color = POWER_UP_TYPES[power_type][2]
+        center_x = center_y = radius
+        left = top = radius - size // 2
         
         # Draw outer glow
-        pygame.draw.circle(screen, self.color, 
-                         (self.x + self.width // 2, self.y + self.height // 2), 
-                         self.width // 2 + int(glow_intensity), 0)
+        pygame.draw.circle(surface, color, (center_x, center_y), radius, 0)
         
         # Draw main capsule
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-        pygame.draw.rect(screen, WHITE, (self.x + 2, self.y + 2, self.width - 4, self.height - 4))
+        pygame.draw.rect(surface, color, (left, top, size, size))
+        pygame.draw.rect(surface, WHITE, (left + 2, top + 2, size - 4, size - 4))
         
         # Draw type indicator
-        center_x = self.x + self.width // 2
-        center_y = self.y + self.height // 2
-        
-        if self.type == "rapid_fire":
+        if power_type == "rapid_fire":
             # Draw bullets symbol
-            pygame.draw.circle(screen, RED, (center_x, center_y - 3), 2)
-            pygame.draw.circle(screen, RED, (center_x, center_y + 3), 2)
-        elif self.type == "shield":
+            pygame.draw.circle(surface, RED, (center_x, center_y - 3), 2)
+            pygame.draw.circle(surface, RED, (center_x, center_y + 3), 2)
+        elif power_type == "shield":
             # Draw shield symbol
-            pygame.draw.circle(screen, CYAN, (center_x, center_y), 6, 2)
-        elif self.type == "double_score":
+            pygame.draw.circle(surface, CYAN, (center_x, center_y), 6, 2)
+        elif power_type == "double_score":
             # Draw "2X" symbol
-            font = pygame.font.Font(None, 16)
-            text = font.render("2X", True, GREEN)
+            text = text_cache.render("2X", GREEN, 16)
             text_rect = text.get_rect(center=(center_x, center_y))
-            screen.blit(text, text_rect)
-        elif self.type == "triple_shot":
+            surface.blit(text, text_rect)
+        elif power_type == "triple_shot":
             # Draw three lines for triple shot
-            pygame.draw.line(screen, PURPLE, (center_x - 6, center_y - 6), (center_x - 6, center_y + 6), 2)
-            pygame.draw.line(screen, PURPLE, (center_x, center_y - 6), (center_x, center_y + 6), 2)
-            pygame.draw.line(screen, PURPLE, (center_x + 6, center_y - 6), (center_x + 6, center_y + 6), 2)
-        elif self.type == "laser_beam":
+            pygame.draw.line(surface, PURPLE, (center_x - 6, center_y - 6), (center_x - 6, center_y + 6), 2)
+            pygame.draw.line(surface, PURPLE, (center_x, center_y - 6), (center_x, center_y + 6), 2)
+            pygame.draw.line(surface, PURPLE, (center_x + 6, center_y - 6), (center_x + 6, center_y + 6), 2)
+        elif power_type == "laser_beam":
             # Draw laser symbol
-            pygame.draw.line(screen, (255, 0, 255), (center_x, center_y - 8), (center_x, center_y + 8), 3)
-        elif self.type == "time_slow":
+            pygame.draw.line(surface, (255, 0, 255), (center_x, center_y - 8), (center_x, center_y + 8), 3)
+        elif power_type == "time_slow":
             # Draw clock symbol
-            pygame.draw.circle(screen, (0, 255, 255), (center_x, center_y), 6, 2)
-            pygame.draw.line(screen, (0, 255, 255), (center_x, center_y), (center_x, center_y - 4), 2)
-            pygame.draw.line(screen, (0, 255, 255), (center_x, center_y), (center_x + 3, center_y), 2)
-        elif self.type == "mega_bullets":
+            pygame.draw.circle(surface, (0, 255, 255), (center_x, center_y), 6, 2)
+            pygame.draw.line(surface, (0, 255, 255), (center_x, center_y), (center_x, center_y - 4), 2)
+            pygame.draw.line(surface, (0, 255, 255), (center_x, center_y), (center_x + 3, center_y), 2)
+        elif power_type == "mega_bullets":
             # Draw large bullet symbol
-            pygame.draw.rect(screen, ORANGE, (center_x - 3, center_y - 6, 6, 12))
+            pygame.draw.rect(surface, ORANGE, (center_x - 3, center_y - 6, 6, 12))
+        return surface
 
 class Explosion:
     """Simple explosion effect for collisions"""
     
-    def __init__(self, x, y, size="small"):
+    __slots__ = ("x", "y", "size", "timer", "max_timer", "particles", "rng")
+    
+    SNAPSHOT = struct.Struct("<dd?dI")  # x, y, large, timer, particle count
+    PARTICLE = struct.Struct("<ddddd")  # x, y, vx, vy, life
+    
+    def __init__(self, x, y, size="small", rng=None):
+        self.rng = rng if rng is not None else random
+        self.reset(x, y, size)
+    
+    def reset(self, x, y, size="small"):
+        """Initialize (or reinitialize a pooled) explosion"""
         self.x = x
         self.y = y
         self.size = size
@@ -400,256 +1075,1654 @@ class Explosion:
         # Create explosion particles
         particle_count = 15 if size == "large" else 8
         for _ in range(particle_count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 6)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(2, 6)
             self.particles.append({
                 'x': x,
                 'y': y,
                 'vx': math.cos(angle) * speed,
                 'vy': math.sin(angle) * speed,
-                'life': random.randint(10, 20)
+                'life': self.rng.randint(10, 20)
             })
     
-    def update(self):
-        """Update explosion animation"""
-        self.timer += 1
+    def update(self, scale=1.0):
+        """Update explosion animation; timer and lifetimes count 60 Hz frames"""
+        self.timer += scale
         
         # Update particles
         for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
+            particle['x'] += particle['vx'] * scale
+            particle['y'] += particle['vy'] * scale
+            particle['life'] -= scale
             
             if particle['life'] <= 0:
                 self.particles.remove(particle)
     
+    def pack_state(self, out):
+        """Append the explosion and its particles to a snapshot buffer"""
+        out += self.SNAPSHOT.pack(self.x, self.y, self.size == "large", self.timer, len(self.particles))
+        pack = self.PARTICLE.pack
+        for particle in self.particles:
+            out += pack(particle['x'], particle['y'], particle['vx'], particle['vy'], particle['life'])
+    
+    def unpack_state(self, data, offset):
+        """Restore an explosion written by pack_state; return the next offset"""
+        self.x, self.y, large, self.timer, count = self.SNAPSHOT.unpack_from(data, offset)
+        offset += self.SNAPSHOT.size
+        self.size = "large" if large else "small"
+        self.max_timer = 20
+        self.particles = [
+            {'x': x, 'y': y, 'vx': vx, 'vy': vy, 'life': life}
+            for x, y, vx, vy, life in self.PARTICLE.iter_unpack(data[offset:offset + count * self.PARTICLE.size])
+        ]
+        return offset + count * self.PARTICLE.size
+    
     def is_finished(self):
         """Check if explosion animation is complete"""
         return self.timer > self.max_timer and len(self.particles) == 0
     
-    def draw(self, screen):
-        """Draw explosion particles"""
-        for particle in self.particles:
-            alpha = max(0, particle['life'] * 12)
-            color = (255, min(255, alpha), 0)  # Orange to red fade
-            size = max(1, particle['life'] // 3)
-            pygame.draw.circle(screen, color, 
-                             (int(particle['x']), int(particle['y'])), size)
+    def get_draw_rect(self):
+        """Return the screen area covered by live particles, or None"""
+        if not self.particles:
+            return None
+        xs = [int(particle['x']) for particle in self.particles]
+        ys = [int(particle['y']) for particle in self.particles]
+        return pygame.Rect(min(xs) - 8, min(ys) - 8, max(xs) - min(xs) + 16, max(ys) - min(ys) + 16)
+    
+    def add_blits(self, blits):
+        """Append the explosion's particle sprites to a frame's blit list"""
+        get_sprite = ParticleEngine.get_sprite
+        for particle in self.particles[::render_quality.particle_stride]:
+            sprite, size = get_sprite(math.ceil(particle['life']))
+            blits.append((sprite, (int(particle['x']) - size, int(particle['y']) - size)))
 
-class GameManager:
-    """Main game manager handling game state, spawning, and collision detection"""
+class ObjectPool:
+    """Free list of entities that are reset for reuse instead of reallocated
     
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("2D Arcade Space Shooter")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
-        
-        # Game state
-        self.running = True
-        self.game_over = False
-        self.score = 0
-        self.start_time = time.time()
-        
-        # Game objects
-        self.player = Player(SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT - 50)
-        self.meteors = []
-        self.bullets = []
-        self.power_ups = []
-        self.explosions = []
-        
-        # Spawn timers
-        self.last_meteor_spawn = 0
-        self.last_power_up_spawn = 0
-        self.meteor_spawn_rate = 1000  # milliseconds
-        self.power_up_spawn_rate = random.randint(8000, 12000)  # 8-12 seconds
+    Objects are created without calling __init__ and initialized through
+    their reset() method, with any fixed attributes (such as the store an
+    array-backed view belongs to) bound on creation.
+    """
     
-    def draw_heart(self, screen, x, y, size=20, filled=True):
-        """Draw a heart shape"""
-        color = RED if filled else GRAY
-        
-        # Heart shape using circles and triangle
-        # Two circles for the top
-        circle_radius = size // 4
-        pygame.draw.circle(screen, color, (x + circle_radius, y + circle_radius), circle_radius)
-        pygame.draw.circle(screen, color, (x + size - circle_radius, y + circle_radius), circle_radius)
-        
-        # Triangle for the bottom
-        points = [
-            (x, y + circle_radius),
-            (x + size, y + circle_radius),
-            (x + size // 2, y + size)
-        ]
-        pygame.draw.polygon(screen, color, points)
+    def __init__(self, cls, size=0, **bound):
+        self.cls = cls
+        self.bound = bound
+        self.free = [self.create() for _ in range(size)]
+        self.created = size
+        self.reused = 0
+        self.in_use = 0
+        self.peak_in_use = 0
     
-    def handle_events(self):
-        """Handle pygame events"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.running = False
-                elif event.key == pygame.K_r and self.game_over:
-                    self.restart_game()
+    def create(self):
+        """Return a blank, uninitialized object"""
+        obj = self.cls.__new__(self.cls)
+        for name, value in self.bound.items():
+            setattr(obj, name, value)
+        return obj
     
-    def handle_input(self):
-        """Handle continuous keyboard input"""
-        if not self.game_over:
-            keys = pygame.key.get_pressed()
-            
-            # Player movement
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                self.player.move("left")
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                self.player.move("right")
-            
-            # Shooting
-            if keys[pygame.K_SPACE]:
-                bullets = self.player.shoot()
-                if bullets:
-                    self.bullets.extend(bullets)
+    def take(self):
+        """Return an object for the caller to initialize, reusing a free one when available"""
+        if self.free:
+            obj = self.free.pop()
+            self.reused += 1
+        else:
+            obj = self.create()
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
+        return obj
     
-    def spawn_meteors(self):
-        """Spawn meteors at regular intervals"""
-        current_time = pygame.time.get_ticks()
-        
-        if current_time - self.last_meteor_spawn > self.meteor_spawn_rate:
-            self.last_meteor_spawn = current_time
-            
-            # Spawn 1-2 meteors
-            for _ in range(random.randint(1, 2)):
-                x = random.randint(0, SCREEN_WIDTH - 40)
-                size_type = random.choice(["large", "large", "small"])  # 2:1 ratio
-                self.meteors.append(Meteor(x, -50, size_type))
-            
-            # Gradually increase spawn rate (decrease interval)
-            if self.meteor_spawn_rate > 400:
-                self.meteor_spawn_rate -= 10
+    def acquire(self, *args, **kwargs):
+        """Return an object initialized through its reset() method"""
+        obj = self.take()
+        obj.reset(*args, **kwargs)
+        return obj
     
-    def spawn_power_ups(self):
-        """Spawn power-ups occasionally"""
-        current_time = pygame.time.get_ticks()
-        
-        if current_time - self.last_power_up_spawn > self.power_up_spawn_rate:
-            self.last_power_up_spawn = current_time
-            self.power_up_spawn_rate = random.randint(8000, 12000)  # Reset timer
-            
-            x = random.randint(0, SCREEN_WIDTH - 25)
-            self.power_ups.append(PowerUp(x, -30))
+    def release(self, obj):
+        """Return an object to the free list"""
+        self.in_use -= 1
+        self.free.append(obj)
     
-    def update_game_objects(self):
-        """Update all game objects"""
-        if not self.game_over:
-            # Update player
-            self.player.update()
-            
-            # Update bullets
-            for bullet in self.bullets[:]:
-                bullet.update(self.player.time_slow)
-                if bullet.is_off_screen():
-                    self.bullets.remove(bullet)
-            
-            # Update meteors
-            for meteor in self.meteors[:]:
-                meteor.update(self.player.time_slow)
-                if meteor.is_off_screen():
-                    self.meteors.remove(meteor)
-            
-            # Update power-ups
-            for power_up in self.power_ups[:]:
-                power_up.update()
-                if power_up.is_off_screen():
-                    self.power_ups.remove(power_up)
+    def stats(self):
+        """Return pool size and usage counters"""
+        return {
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+
+class ParticleEngine:
+    """Shared ring buffer of explosion particles updated and drawn in batches
+    
+    Every slot remembers which emission wrote it. Once the ring wraps onto an
+    older explosion's particles, owned() stops returning those rows to it.
+    """
+    
+    SNAPSHOT = struct.Struct("<Iqq")  # live particles, ring head, emissions so far
+    sprites = {}  # life -> (circle sprite, radius), shared by every explosion
+    
+    def __init__(self, capacity=4096):
+        if np is None:
+            raise RuntimeError("ParticleEngine requires NumPy")
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)  # 60 Hz frames left; fractional at coarse tick rates
+        self.owner = np.full(capacity, -1, dtype=np.int64)  # emission that wrote each slot
+        self.head = 0
+        self.emitted = 0
+    
+    def emit(self, x, y, vx, vy, life):
+        """Write a batch of particles at the ring head, overwriting the oldest ones
         
-        # Update explosions (always)
-        for explosion in self.explosions[:]:
-            explosion.update()
-            if explosion.is_finished():
-                self.explosions.remove(explosion)
+        Returns the rows written and the emission's token for owned().
+        """
+        count = len(life)
+        rows = (self.head + np.arange(count)) % self.capacity
+        self.x[rows] = x
+        self.y[rows] = y
+        self.vx[rows] = vx
+        self.vy[rows] = vy
+        self.life[rows] = life
+        token = self.emitted
+        self.owner[rows] = token
+        self.emitted += 1
+        self.head = (self.head + count) % self.capacity
+        return rows, token
     
-    def check_collisions(self):
-        """Check all collision detection"""
-        if self.game_over:
+    def owned(self, rows, token):
+        """Return the rows a later emission has not overwritten"""
+        return rows[self.owner[rows] == token]
+    
+    def update(self, scale=1.0):
+        """Advance every live particle by one step of scale 60 Hz frames"""
+        live = self.life > 0
+        if not live.any():
+            return
+        self.x[live] += self.vx[live] * scale
+        self.y[live] += self.vy[live] * scale
+        self.life[live] -= scale
+    
+    def clear(self):
+        """Kill every particle"""
+        self.life[:] = 0
+    
+    def pack_state(self, out):
+        """Append the ring head and every live particle to a snapshot buffer"""
+        rows = np.flatnonzero(self.life > 0)
+        out += self.SNAPSHOT.pack(len(rows), self.head, self.emitted)
+        if len(rows):
+            out += rows.astype(np.int32).tobytes()
+            for column in (self.x, self.y, self.vx, self.vy, self.life, self.owner):
+                out += column[rows].tobytes()
+    
+    def unpack_state(self, data, offset):
+        """Replace every particle with those written by pack_state; return the next offset"""
+        count, self.head, self.emitted = self.SNAPSHOT.unpack_from(data, offset)
+        offset += self.SNAPSHOT.size
+        self.life[:] = 0
+        self.owner[:] = -1
+        if count:
+            rows = np.frombuffer(data, np.int32, count, offset)
+            offset += rows.nbytes
+            for column in (self.x, self.y, self.vx, self.vy, self.life, self.owner):
+                values = np.frombuffer(data, column.dtype, count, offset)
+                column[rows] = values
+                offset += values.nbytes
+        return offset
+    
+    @classmethod
+    def get_sprite(cls, life):
+        """Return the cached circle sprite used for particles with this much life left"""
+        sprite = cls.sprites.get(life)
+        if sprite is None:
+            alpha = max(0, life * 12)
+            color = (255, min(255, alpha), 0)  # Orange to red fade
+            size = max(1, life // 3)
+            surface = pygame.Surface((size * 2, size * 2))
+            surface.set_colorkey(BLACK)
+            pygame.draw.circle(surface, color, (size, size), size)
+            sprite = cls.sprites[life] = (surface, size)
+        return sprite
+    
+    def add_blits(self, blits, rows=None):
+        """Append live particles (all of them, or only the given rows) to a frame's blit list"""
+        if rows is None:
+            rows = np.flatnonzero(self.life > 0)
+        else:
+            rows = rows[self.life[rows] > 0]
+        rows = rows[::render_quality.particle_stride]
+        if len(rows) == 0:
             return
         
-        # Bullet-meteor collisions
-        for bullet in self.bullets[:]:
-            for meteor in self.meteors[:]:
-                if bullet.get_rect().colliderect(meteor.get_rect()):
-                    # Create explosion
-                    self.explosions.append(Explosion(meteor.x + meteor.width // 2, 
-                                                   meteor.y + meteor.height // 2, 
-                                                   meteor.size_type))
-                    
-                    # Award points
-                    points = meteor.points
-                    if self.player.double_score:
-                        points *= 2
-                    self.score += points
-                    
-                    # Remove objects
-                    self.bullets.remove(bullet)
-                    self.meteors.remove(meteor)
+        get_sprite = self.get_sprite
+        for life, px, py in zip(np.ceil(self.life[rows]).astype(int).tolist(),
+                                self.x[rows].astype(int).tolist(),
+                                self.y[rows].astype(int).tolist()):
+            sprite, size = get_sprite(life)
+            blits.append((sprite, (px - size, py - size)))
+
+
+class ParticleExplosion:
+    """Explosion whose particles live in a shared ParticleEngine
+    
+    Drop-in replacement for Explosion. The owner advances the engine once per
+    frame before updating the explosions.
+    """
+    
+    __slots__ = ("engine", "x", "y", "size", "timer", "max_timer", "rows", "token", "frames_left",
+                 "rng")
+    
+    # x, y, large, timer, frames left, emission token, engine row count
+    SNAPSHOT = struct.Struct("<dd?ddqI")
+    
+    def __init__(self, engine, x, y, size="small", rng=None):
+        self.engine = engine
+        self.rng = rng if rng is not None else random
+        self.reset(x, y, size)
+    
+    def reset(self, x, y, size="small"):
+        """Initialize (or reinitialize a pooled) explosion"""
+        self.x = x
+        self.y = y
+        self.size = size
+        self.timer = 0
+        self.max_timer = 20
+        
+        # Draw particle parameters in the same order as Explosion
+        particle_count = 15 if size == "large" else 8
+        vx, vy, life = [], [], []
+        for _ in range(particle_count):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            speed = self.rng.uniform(2, 6)
+            vx.append(math.cos(angle) * speed)
+            vy.append(math.sin(angle) * speed)
+            life.append(self.rng.randint(10, 20))
+        
+        self.rows, self.token = self.engine.emit(x, y, vx, vy, life)
+        self.frames_left = max(life)
+    
+    def pack_state(self, out):
+        """Append the explosion and the engine rows it owns to a snapshot buffer"""
+        out += self.SNAPSHOT.pack(self.x, self.y, self.size == "large", self.timer,
+                                  self.frames_left, self.token, len(self.rows))
+        out += self.rows.astype(np.int32).tobytes()
+    
+    def unpack_state(self, data, offset):
+        """Restore an explosion written by pack_state; its particles come back with the engine"""
+        (self.x, self.y, large, self.timer, self.frames_left, self.token,
+         count) = self.SNAPSHOT.unpack_from(data, offset)
+        offset += self.SNAPSHOT.size
+        self.size = "large" if large else "small"
+        self.max_timer = 20
+        self.rows = np.frombuffer(data, np.int32, count, offset).astype(np.intp)
+        return offset + count * 4
+    
+    def update(self, scale=1.0):
+        """Update explosion animation; timer and frames left count 60 Hz frames"""
+        self.timer += scale
+        self.frames_left -= scale
+    
+    def is_finished(self):
+        """Check if explosion animation is complete"""
+        return self.timer > self.max_timer and self.frames_left <= 0
+    
+    def get_draw_rect(self):
+        """Return the screen area covered by live particles, or None"""
+        engine = self.engine
+        rows = engine.owned(self.rows, self.token)
+        rows = rows[engine.life[rows] > 0]
+        if len(rows) == 0:
+            return None
+        xs = engine.x[rows].astype(int)
+        ys = engine.y[rows].astype(int)
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left - 8, top - 8, int(xs.max()) - left + 16, int(ys.max()) - top + 16)
+    
+    def add_blits(self, blits):
+        """Append the explosion's live particles to a frame's blit list"""
+        self.engine.add_blits(blits, self.engine.owned(self.rows, self.token))
+
+
+class EntityStore:
+    """Structure-of-arrays storage for meteors or bullets held in NumPy arrays
+    
+    Rows are kept in the same order as the list of entity views in ``views``,
+    so the store can move, cull and compact every entity with a handful of
+    vectorized operations per frame while the views keep the per-object API.
+    """
+    
+    COLUMNS = ("x", "y", "vx", "vy", "width", "height", "rotation", "spin", "expires")
+    
+    def __init__(self, cull="below", capacity=256):
+        if np is None:
+            raise RuntimeError("EntityStore requires NumPy")
+        self.cull = cull  # "below" for meteors, "outside" for bullets
+        self.capacity = capacity
+        self.count = 0
+        self.views = []
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+        self.handle = np.zeros(capacity, dtype=np.intp)  # row -> view handle
+        self.row_of = np.zeros(capacity, dtype=np.intp)  # view handle -> row
+        self.free_handles = list(range(capacity - 1, -1, -1))
+        self.on_remove = None  # called with the views of removed rows
+    
+    def grow(self):
+        """Double the capacity of every column"""
+        old = self.capacity
+        self.capacity *= 2
+        for name in self.COLUMNS + ("handle", "row_of"):
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:old] = column
+            setattr(self, name, grown)
+        self.free_handles.extend(range(self.capacity - 1, old - 1, -1))
+    
+    def allocate(self):
+        """Reserve the next row and return the handle its view should use"""
+        if self.count == self.capacity:
+            self.grow()
+        row = self.count
+        handle = self.free_handles.pop()
+        for name in self.COLUMNS:
+            getattr(self, name)[row] = 0.0
+        self.expires[row] = math.inf
+        self.handle[row] = handle
+        self.row_of[handle] = row
+        self.count += 1
+        return handle
+    
+    def update(self, speed_multiplier, now):
+        """Move every entity, cull the ones that left the screen and compact the rows"""
+        self.move(speed_multiplier)
+        self.remove_off_screen(now)
+    
+    def move(self, speed_multiplier):
+        """Move every entity along its velocity"""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        x += self.vx[:n] * speed_multiplier
+        y += self.vy[:n] * speed_multiplier
+        self.rotation[:n] += self.spin[:n] * speed_multiplier
+    
+    def remove_off_screen(self, now):
+        """Cull the entities that left the screen or expired and compact the rows"""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        if self.cull == "below":
+            dead = y > SCREEN_HEIGHT
+        else:
+            dead = (y < 0) | (x < 0) | (x > SCREEN_WIDTH)
+        dead |= now > self.expires[:n]
+        self.remove(dead)
+    
+    def remove(self, dead):
+        """Drop the rows flagged in a boolean mask, keeping the survivors in order"""
+        n = self.count
+        dead = np.asarray(dead, dtype=bool)
+        if not dead.any():
+            return
+        if self.on_remove is not None:
+            self.on_remove([self.views[row] for row in np.flatnonzero(dead).tolist()])
+        keep = np.flatnonzero(~dead)
+        k = len(keep)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:k] = column[keep]
+        self.free_handles.extend(self.handle[:n][dead].tolist())
+        self.handle[:k] = self.handle[keep]
+        self.row_of[self.handle[:k]] = np.arange(k)
+        self.count = k
+        
+        if k == 0:
+            self.views.clear()
+        elif k == 1:
+            self.views[:] = [self.views[keep[0]]]
+        else:
+            self.views[:] = operator.itemgetter(*keep.tolist())(self.views)
+    
+    def clear(self):
+        """Remove every entity"""
+        if self.on_remove is not None and self.views:
+            self.on_remove(list(self.views))
+        self.views.clear()
+        self.free_handles = list(range(self.capacity - 1, -1, -1))
+        self.count = 0
+    
+    def shift_back(self, steps):
+        """Move every entity back along its velocity; return the exact positions to restore"""
+        n = self.count
+        saved = (self.x[:n].copy(), self.y[:n].copy(), self.rotation[:n].copy())
+        self.x[:n] -= self.vx[:n] * steps
+        self.y[:n] -= self.vy[:n] * steps
+        self.rotation[:n] -= self.spin[:n] * steps
+        return saved
+    
+    def restore_positions(self, saved):
+        """Undo shift_back"""
+        x, y, rotation = saved
+        n = len(x)
+        self.x[:n], self.y[:n], self.rotation[:n] = x, y, rotation
+    
+    def pack_state(self, out):
+        """Append every column of the live rows to a snapshot buffer"""
+        n = self.count
+        for name in self.COLUMNS:
+            out += getattr(self, name)[:n].tobytes()
+    
+    def unpack_state(self, data, offset):
+        """Refill an empty store from pack_state data for the restored views; return the next offset"""
+        views = self.views
+        n = len(views)
+        while self.capacity < n:
+            self.grow()
+        for name in self.COLUMNS:
+            getattr(self, name)[:n] = np.frombuffer(data, np.float64, n, offset)
+            offset += n * 8
+        
+        # Handles restart from zero, so each view's handle is its row
+        for handle, view in enumerate(views):
+            view.handle = handle
+        self.handle[:n] = self.row_of[:n] = np.arange(n)
+        self.free_handles = list(range(self.capacity - 1, n - 1, -1))
+        self.count = n
+        return offset
+
+
+class StoreField:
+    """Descriptor exposing one EntityStore column as an entity attribute"""
+    
+    def __init__(self, column):
+        self.column = column
+    
+    def __get__(self, view, owner):
+        if view is None:
+            return self
+        store = view.store
+        return getattr(store, self.column)[store.row_of[view.handle]]
+    
+    def __set__(self, view, value):
+        store = view.store
+        getattr(store, self.column)[store.row_of[view.handle]] = value
+
+
+class ArrayMeteor(Meteor):
+    """Meteor view whose position and motion live in an EntityStore"""
+    
+    x = StoreField("x")
+    y = StoreField("y")
+    width = StoreField("width")
+    height = StoreField("height")
+    vx = StoreField("vx")
+    speed = StoreField("vy")
+    rotation = StoreField("rotation")
+    rotation_speed = StoreField("spin")
+    
+    __slots__ = ("store", "handle")
+    
+    def __init__(self, store, x, y, size_type="large", rng=None, speed_ranges=None):
+        self.store = store
+        super().__init__(x, y, size_type, rng, speed_ranges)
+    
+    def reset(self, x, y, size_type="large"):
+        """Claim a new store row and initialize the meteor in it"""
+        self.handle = self.store.allocate()
+        super().reset(x, y, size_type)
+    
+    def pack_state(self, out):
+        """Append the meteor's size; its numeric fields are packed with the store"""
+        out.append(self.size_type == "large")
+    
+    def unpack_state(self, data, offset):
+        """Restore the meteor's size; the store restores its row afterwards"""
+        self.size_type = "large" if data[offset] else "small"
+        self.points = 10
+        return offset + 1
+
+
+class ArrayBullet(Bullet):
+    """Bullet view whose position and velocity live in an EntityStore"""
+    
+    x = StoreField("x")
+    y = StoreField("y")
+    vx = StoreField("vx")
+    vy = StoreField("vy")
+    width = StoreField("width")
+    height = StoreField("height")
+    
+    __slots__ = ("store", "handle")
+    
+    VIEW_SNAPSHOT = struct.Struct("<d?")  # angle, mega
+    
+    def __init__(self, store, x, y, angle=0, mega=False):
+        self.store = store
+        super().__init__(x, y, angle, mega)
+    
+    def reset(self, x, y, angle=0, mega=False):
+        """Claim a new store row and initialize the bullet in it"""
+        self.handle = self.store.allocate()
+        super().reset(x, y, angle, mega)
+    
+    def pack_state(self, out):
+        """Append angle and size; position and velocity are packed with the store"""
+        out += self.VIEW_SNAPSHOT.pack(self.angle, self.mega)
+    
+    def unpack_state(self, data, offset):
+        """Restore angle and size; the store restores the bullet's row afterwards"""
+        self.angle, mega = self.VIEW_SNAPSHOT.unpack_from(data, offset)
+        self.mega = mega
+        self.speed = 10 if mega else 8
+        self.damage = 2 if mega else 1
+        return offset + self.VIEW_SNAPSHOT.size
+
+
+class ArrayLaser(LaserBeam):
+    """Laser beam view stored alongside bullets; the store expires it by time"""
+    
+    x = StoreField("x")
+    y = StoreField("y")
+    width = StoreField("width")
+    height = StoreField("height")
+    
+    __slots__ = ("store", "handle")
+    
+    def __init__(self, store, x, y, clock):
+        self.store = store
+        super().__init__(x, y, clock)
+    
+    def reset(self, x, y, clock):
+        """Claim a new store row and initialize the beam in it"""
+        self.handle = self.store.allocate()
+        super().reset(x, y, clock)
+        self.store.expires[self.store.row_of[self.handle]] = self.created_time + self.lifetime
+    
+    def pack_state(self, out):
+        """Append the creation time; position and expiry are packed with the store"""
+        out += NUMBER.pack(self.created_time)
+    
+    def unpack_state(self, data, offset):
+        """Restore the creation time; the store restores the beam's row afterwards"""
+        (self.created_time,) = NUMBER.unpack_from(data, offset)
+        self.speed = 0
+        self.damage = 5
+        self.lifetime = 200
+        return offset + NUMBER.size
+
+
+class Starfield:
+    """Parallax star layers rendered once and scrolled with one wrapped blit per layer"""
+    
+    LAYER_COLORS = [(90, 90, 90), (170, 170, 170), WHITE]
+    
+    def __init__(self, layers=3, density=60, speed=0.25, seed=None):
+        self.layer_count = layers
+        self.density = density  # total stars across all layers
+        self.speed = speed  # pixels per frame of the farthest layer
+        self.rng = random.Random(seed)  # never touches the gameplay random stream
+        self.layers = []
+    
+    def build(self):
+        """Render each layer twice, stacked vertically, so any scroll offset is one blit"""
+        self.layers = []
+        count = max(1, self.layer_count)
+        for index in range(count):
+            # Bottom layer is opaque and replaces clearing the screen
+            surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT * 2))
+            surface.fill(BLACK)
+            if index > 0:
+                surface.set_colorkey(BLACK)
+            
+            # Nearer layers are brighter, and the nearest of three or more has bigger stars
+            color = self.LAYER_COLORS[(index + 1) * len(self.LAYER_COLORS) // count - 1]
+            radius = 2 if index == count - 1 and count > 2 else 1
+            for _ in range(self.density // count):
+                x = self.rng.randint(0, SCREEN_WIDTH)
+                y = self.rng.randint(radius, SCREEN_HEIGHT - radius)
+                pygame.draw.circle(surface, color, (x, y), radius)
+                pygame.draw.circle(surface, color, (x, y + SCREEN_HEIGHT), radius)
+            
+            self.layers.append([surface, self.speed * (index + 1), 0.0])
+    
+    def draw(self, screen, scroll=True, scale=1.0):
+        """Scroll and blit every layer; scale is the elapsed time in 60 Hz frames"""
+        if not self.layers:
+            self.build()
+        
+        for layer in self.layers:
+            surface, speed, offset = layer
+            if scroll:
+                offset = (offset + speed * scale) % SCREEN_HEIGHT
+                layer[2] = offset
+            area = pygame.Rect(0, SCREEN_HEIGHT - int(offset), SCREEN_WIDTH, SCREEN_HEIGHT)
+            screen.blit(surface, (0, 0), area)
+
+class HudLayer:
+    """HUD surfaces re-composited only when the values they show change"""
+    
+    PANEL_SIZE = (260, 270)  # score, lives and up to seven power-up labels
+    TIMER_RECT = pygame.Rect(SCREEN_WIDTH - 150, 0, 150, 40)
+    
+    def __init__(self):
+        self.panel = None
+        self.panel_state = None
+        self.timer_text = None
+        self.timer_seconds = None
+        self.redraws = 0
+    
+    def panel_state_for(self, game):
+        """Return the values shown on the panel"""
+        return (game.score, game.player.lives, tuple(game.active_power_labels()))
+    
+    def draw(self, screen, game):
+        """Blit the HUD, rebuilding the panel or timer text only if their values changed"""
+        state = self.panel_state_for(game)
+        active_powers = list(state[2])
+        if state != self.panel_state:
+            self.panel_state = state
+            self.panel = self.render_panel(game, active_powers)
+            self.redraws += 1
+        screen.blit(self.panel, (0, 0))
+        
+        # Timer
+        seconds = int(game.get_remaining_time())
+        if seconds != self.timer_seconds:
+            self.timer_seconds = seconds
+            self.timer_text = text_cache.render(f"Time: {seconds}s", WHITE)
+        screen.blit(self.timer_text, (SCREEN_WIDTH - 150, 10))
+    
+    def get_areas(self):
+        """Return every screen area the HUD draws into"""
+        return [pygame.Rect((0, 0), self.PANEL_SIZE), self.TIMER_RECT.copy()]
+    
+    def get_draw_rects(self, game):
+        """Return the HUD areas whose contents will change on the next draw"""
+        rects = []
+        if self.panel_state_for(game) != self.panel_state:
+            rects.append(pygame.Rect((0, 0), self.PANEL_SIZE))
+        if int(game.get_remaining_time()) != self.timer_seconds:
+            rects.append(self.TIMER_RECT.copy())
+        return rects
+    
+    def render_panel(self, game, active_powers):
+        """Compose the score, hearts and power-up labels onto a transparent panel"""
+        panel = pygame.Surface(self.PANEL_SIZE, pygame.SRCALPHA)
+        
+        # Score
+        panel.blit(text_cache.render(f"Score: {game.score}", WHITE), (10, 10))
+        
+        # Lives as hearts
+        panel.blit(text_cache.render("Lives:", WHITE), (10, 50))
+        heart_x = 90
+        for i in range(3):
+            filled = i < game.player.lives
+            panel.blit(*sprite_atlas.place(("heart", filled), heart_x + i * 30, 55))
+        
+        # Power-up indicators
+        y_offset = 90
+        for power_name, color in active_powers:
+            panel.blit(text_cache.render(power_name, color, 24), (10, y_offset))
+            y_offset += 25
+        return panel
+    
+    @staticmethod
+    def render_heart(filled, size=20):
+        """Render a heart shape onto a new surface"""
+        surface = pygame.Surface((size + 1, size + 1), pygame.SRCALPHA)
+        color = RED if filled else GRAY
+        
+        # Heart shape using circles and triangle
+        # Two circles for the top
+        circle_radius = size // 4
+        pygame.draw.circle(surface, color, (circle_radius, circle_radius), circle_radius)
+        pygame.draw.circle(surface, color, (size - circle_radius, circle_radius), circle_radius)
+        
+        # Triangle for the bottom
+        points = [
+            (0, circle_radius),
+            (size, circle_radius),
+            (size // 2, size)
+        ]
+        pygame.draw.polygon(surface, color, points)
+        return surface
+
+class DirtyRectRenderer:
+    """Redraws and pushes only the screen regions that entities covered this frame or last
+    
+    Regions are restored from a cached static background. When the dirty
+    area exceeds max_dirty_fraction of the screen it falls back to a full flip.
+    """
+    
+    def __init__(self, max_dirty_fraction=0.4):
+        self.max_dirty_fraction = max_dirty_fraction
+        self.background = None
+        self.previous_rects = None
+        self.full_frames = 0
+        self.partial_frames = 0
+    
+    def draw(self, game):
+        """Draw one frame of the game"""
+        screen = game.screen
+        if self.background is None:
+            self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            game.starfield.draw(self.background, scroll=False)
+        
+        screen_rect = screen.get_rect()
+        current_rects = [rect.clip(screen_rect) for rect in game.get_draw_rects()]
+        dirty_area = sum(rect.width * rect.height for rect in current_rects)
+        if self.previous_rects is not None:
+            dirty_area += sum(rect.width * rect.height for rect in self.previous_rects)
+        
+        full = (self.previous_rects is None or game.game_over
+                or dirty_area > self.max_dirty_fraction * SCREEN_WIDTH * SCREEN_HEIGHT)
+        if full:
+            screen.blit(self.background, (0, 0))
+        else:
+            # HUD text is blended, so its areas are always restored before it is redrawn
+            for rect in self.previous_rects + current_rects + game.hud.get_areas():
+                screen.blit(self.background, rect, rect)
+        profiler = game.profiler
+        if profiler is not None:
+            profiler.mark("draw.background")
+        
+        game.draw_entities(screen)
+        game.draw_hud()
+        if game.game_over:
+            game.draw_game_over()
+        if profiler is not None:
+            profiler.mark("draw.hud")
+            profiler.draw_overlay(screen)
+        
+        if full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(self.previous_rects + current_rects)
+            self.partial_frames += 1
+        self.previous_rects = current_rects
+        if profiler is not None:
+            profiler.mark("draw.present")
+
+class FrameProfiler:
+    """Times every phase of a frame with perf_counter_ns
+    
+    Phases are closed by mark(name): each mark records the time since the
+    previous one. Recent frames feed rolling p50/p95/p99 statistics and the F3
+    overlay; a longer history is kept for Chrome-trace or CSV export.
+    """
+    
+    OVERLAY_RECT = pygame.Rect(SCREEN_WIDTH - 250, SCREEN_HEIGHT - 150, 240, 140)
+    GRAPH_HEIGHT = 70
+    GRAPH_SCALE = 2.5  # pixels per millisecond; the 16.6 ms budget sits near the top
+    COUNTED = ("meteors", "bullets", "power_ups", "explosions")
+    
+    # Overlay graph colour for each phase prefix
+    CATEGORY_COLORS = {"events": BLUE, "input": BLUE, "timers": GREEN, "update": GREEN,
+                       "collisions": YELLOW, "game_over": GREEN, "spectate": CYAN, "draw": ORANGE}
+    
+    def __init__(self, window=600, history=36000):
+        self.window = window
+        self.history = deque(maxlen=history)
+        self.samples = {}
+        self.overlay_visible = False
+        self.graph = None
+        self.text_panel = None
+        self.origin = time.perf_counter_ns()
+        self.frame_start = self.last = self.origin
+        self.phases = []
+        self.frames = 0
+    
+    def begin_frame(self):
+        """Start timing a new frame"""
+        self.frame_start = self.last = time.perf_counter_ns()
+        self.phases = []
+    
+    def mark(self, phase):
+        """Close the current phase, attributing the time since the last mark to it"""
+        now = time.perf_counter_ns()
+        self.phases.append((phase, self.last, now - self.last))
+        self.last = now
+    
+    def end_frame(self, game):
+        """Finish the frame and record its phases and entity counts"""
+        end = time.perf_counter_ns()
+        counts = tuple(len(getattr(game, name)) for name in self.COUNTED)
+        self.history.append((self.frames, self.frame_start, end - self.frame_start,
+                             self.phases, counts))
+        self.frames += 1
+        
+        samples = self.samples
+        for phase, _, duration in self.phases:
+            if phase not in samples:
+                samples[phase] = deque(maxlen=self.window)
+            samples[phase].append(duration)
+        if "frame" not in samples:
+            samples["frame"] = deque(maxlen=self.window)
+        samples["frame"].append(end - self.frame_start)
+        
+        if self.overlay_visible:
+            self.update_graph()
+    
+    def percentiles(self, phase):
+        """Return (p50, p95, p99) in milliseconds over the rolling window"""
+        ordered = sorted(self.samples.get(phase, ()))
+        if not ordered:
+            return (0.0, 0.0, 0.0)
+        last = len(ordered) - 1
+        return tuple(ordered[round(last * q)] / 1e6 for q in (0.50, 0.95, 0.99))
+    
+    def summary(self):
+        """Return {phase: (p50, p95, p99)} for every phase seen, slowest p95 first"""
+        stats = {phase: self.percentiles(phase) for phase in self.samples}
+        return dict(sorted(stats.items(), key=lambda item: -item[1][1]))
+    
+    def toggle_overlay(self):
+        """Show or hide the in-game timing graph"""
+        self.overlay_visible = not self.overlay_visible
+        self.graph = None
+    
+    def update_graph(self):
+        """Scroll the graph one pixel column and draw the latest frame as a stacked bar"""
+        rect = self.OVERLAY_RECT
+        if self.graph is None:
+            self.graph = pygame.Surface((rect.width, self.GRAPH_HEIGHT))
+            self.graph.fill(BLACK)
+        graph = self.graph
+        graph.scroll(-2, 0)
+        graph.fill(BLACK, (rect.width - 2, 0, 2, self.GRAPH_HEIGHT))
+        
+        y = self.GRAPH_HEIGHT
+        for phase, _, duration in self.phases:
+            height = duration / 1e6 * self.GRAPH_SCALE
+            color = self.CATEGORY_COLORS.get(phase.split(".", 1)[0], WHITE)
+            top = max(0.0, y - height)
+            graph.fill(color, (rect.width - 2, int(top), 2, int(y) - int(top)))
+            y = top
+        budget_y = self.GRAPH_HEIGHT - int(1000 / FPS * self.GRAPH_SCALE)
+        graph.fill(RED, (rect.width - 2, budget_y, 2, 1))
+        
+        # Percentile text is refreshed twice a second
+        if self.frames % (FPS // 2) == 0 or self.text_panel is None:
+            self.text_panel = self.render_text(rect.width, rect.height - self.GRAPH_HEIGHT)
+    
+    def render_text(self, width, height):
+        """Render the frame total and the slowest phases as p50/p95/p99 lines"""
+        panel = pygame.Surface((width, height))
+        panel.fill((20, 20, 30))
+        font = text_cache.get_font(None, 18)
+        y = 4
+        rows = [("p50 / p95 / p99 ms", f"quality level {render_quality.level}")]
+        rows.extend((phase, f"{p50:.2f} / {p95:.2f} / {p99:.2f}")
+                    for phase, (p50, p95, p99) in list(self.summary().items())[:4])
+        for name, values in rows:
+            panel.blit(font.render(name, True, WHITE), (6, y))
+            panel.blit(font.render(values, True, WHITE), (120, y))
+            y += 13
+        return panel
+    
+    def draw_overlay(self, screen):
+        """Blit the timing graph if it is visible"""
+        if not self.overlay_visible or self.graph is None:
+            return
+        rect = self.OVERLAY_RECT
+        screen.blit(self.text_panel, rect.topleft)
+        screen.blit(self.graph, (rect.x, rect.bottom - self.GRAPH_HEIGHT))
+        self.mark("draw.overlay")
+    
+    def export_chrome_trace(self, path):
+        """Write the frame history as Chrome trace JSON (chrome://tracing, Perfetto)"""
+        import json
+        origin = self.origin
+        events = []
+        for frame, start, total, phases, counts in self.history:
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": (start - origin) / 1000, "dur": total / 1000,
+                           "args": {"frame": frame}})
+            for phase, phase_start, duration in phases:
+                events.append({"name": phase, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": (phase_start - origin) / 1000, "dur": duration / 1000})
+            events.append({"name": "entities", "ph": "C", "pid": 1,
+                           "ts": (start - origin) / 1000, "args": dict(zip(self.COUNTED, counts))})
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+    
+    def export_csv(self, path):
+        """Write one row per frame with every phase duration in milliseconds"""
+        import csv
+        phases = []
+        for _, _, _, frame_phases, _ in self.history:
+            for phase, _, _ in frame_phases:
+                if phase not in phases:
+                    phases.append(phase)
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["frame", "start_ms", "total_ms"] + [f"{phase}_ms" for phase in phases]
+                            + list(self.COUNTED))
+            for frame, start, total, frame_phases, counts in self.history:
+                durations = dict.fromkeys(phases, 0)
+                for phase, _, duration in frame_phases:
+                    durations[phase] += duration
+                writer.writerow([frame, f"{(start - self.origin) / 1e6:.3f}", f"{total / 1e6:.3f}"]
+                                + [f"{durations[phase] / 1e6:.3f}" for phase in phases]
+                                + list(counts))
+    
+    def export(self, path):
+        """Export to CSV for a .csv path, Chrome trace JSON otherwise"""
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
+
+class QualityGovernor:
+    """Lowers render_quality in stages while frames run over budget and restores it with headroom
+    
+    Decisions use the mean of the last window frame times. Degrading needs the
+    mean above the budget, restoring needs it below restore_fraction of the
+    budget, and every change is followed by hold_frames without another one,
+    so the level does not oscillate around the threshold.
+    """
+    
+    def __init__(self, budget_ms=1000 / FPS, window=30, restore_fraction=0.6, hold_frames=60,
+                 quality=None):
+        self.budget_ms = budget_ms
+        self.window = window
+        self.restore_fraction = restore_fraction
+        self.hold_frames = hold_frames
+        self.quality = quality if quality is not None else render_quality
+        self.samples = deque(maxlen=window)
+        self.total = 0.0
+        self.frames = 0
+        self.last_change = 0
+        self.changes = []  # (frame, level, mean frame ms) for logging
+    
+    @property
+    def level(self):
+        """Current quality level; 0 is full detail"""
+        return self.quality.level
+    
+    def observe(self, frame_ms):
+        """Record one frame's time and change the level if it is due; return the level"""
+        samples = self.samples
+        if len(samples) == samples.maxlen:
+            self.total -= samples[0]
+        samples.append(frame_ms)
+        self.total += frame_ms
+        self.frames += 1
+        
+        if len(samples) < self.window or self.frames - self.last_change < self.hold_frames:
+            return self.level
+        mean = self.total / len(samples)
+        level = self.level
+        if mean > self.budget_ms and level < len(QUALITY_LEVELS) - 1:
+            self.set_level(level + 1, mean)
+        elif mean < self.budget_ms * self.restore_fraction and level > 0:
+            self.set_level(level - 1, mean)
+        return self.level
+    
+    def set_level(self, level, mean_ms=0.0):
+        """Switch quality level and start measuring it afresh"""
+        self.quality.set_level(level)
+        self.changes.append((self.frames, level, mean_ms))
+        self.last_change = self.frames
+        self.samples.clear()
+        self.total = 0.0
+
+def sweep_time(x, y, width, height, dx, dy, target_x, target_y, target_width, target_height):
+    """Return the earliest fraction of a step (0-1) at which a box moving by (dx, dy)
+    overlaps a stationary target box, or None if it never does"""
+    enter, leave = 0.0, 1.0
+    for start, size, delta, target, target_size in ((x, width, dx, target_x, target_width),
+                                                     (y, height, dy, target_y, target_height)):
+        if delta == 0:
+            if start >= target + target_size or start + size <= target:
+                return None
+            continue
+        t0 = (target - start - size) / delta
+        t1 = (target + target_size - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        enter = max(enter, t0)
+        leave = min(leave, t1)
+        if enter >= leave:
+            return None
+    return enter
+
+class ColumnIndex:
+    """Entity indices sorted by left edge for finding everything inside a vertical column"""
+    
+    def __init__(self, rects):
+        self.rects = rects
+        self.order = sorted(range(len(rects)), key=lambda index: rects[index].left)
+        self.lefts = [rects[index].left for index in self.order]
+        self.max_width = max((rect.width for rect in rects), default=0)
+    
+    def query(self, rect):
+        """Return the indices of all rectangles overlapping rect, in left-edge order"""
+        # Anything overlapping the column starts less than max_width left of it
+        start = bisect.bisect_right(self.lefts, rect.left - self.max_width)
+        end = bisect.bisect_left(self.lefts, rect.right)
+        rects = self.rects
+        return [index for index in self.order[start:end] if rect.colliderect(rects[index])]
+    
+    @classmethod
+    def from_columns(cls, rects):
+        """Build the index from a StoreRects' edge arrays without creating any Rect"""
+        index = cls.__new__(cls)
+        index.rects = rects
+        order = np.argsort(rects.left, kind="stable")
+        index.order = order.tolist()
+        index.lefts = rects.left[order].tolist()
+        index.max_width = int(rects.width.max()) if len(rects) else 0
+        return index
+
+class StoreRects:
+    """Collision rectangles of every EntityStore row, as integer edge arrays
+    
+    Indexing builds the pygame.Rect get_rect() would return for that row, so
+    only the entities a broad phase actually hands back become Rect objects.
+    """
+    
+    def __init__(self, store):
+        n = store.count
+        # Truncate toward zero exactly as pygame.Rect does with float arguments
+        self.left = store.x[:n].astype(np.int64)
+        self.top = store.y[:n].astype(np.int64)
+        self.width = store.width[:n].astype(np.int64)
+        self.height = store.height[:n].astype(np.int64)
+    
+    def __len__(self):
+        return len(self.left)
+    
+    def __getitem__(self, index):
+        return pygame.Rect(int(self.left[index]), int(self.top[index]),
+                           int(self.width[index]), int(self.height[index]))
+
+class SpatialHash:
+    """Uniform grid broad phase that buckets entity indices by the cells their rect covers"""
+    
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def clear(self):
+        """Remove all entries"""
+        self.cells.clear()
+    
+    def cell_range(self, rect):
+        """Return the (x0, y0, x1, y1) cell span covered by a rectangle"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.left, rect.right - 1) // size, max(rect.top, rect.bottom - 1) // size)
+    
+    def insert(self, index, rect):
+        """Add an entity index to every cell its rectangle covers"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [index]
+                else:
+                    bucket.append(index)
+    
+    def insert_columns(self, rects):
+        """Add every row of a StoreRects, as insert() would, with one sort instead of a loop"""
+        count = len(rects)
+        if count == 0:
+            return
+        size = self.cell_size
+        x0 = rects.left // size
+        y0 = rects.top // size
+        x1 = np.maximum(rects.left, rects.left + rects.width - 1) // size
+        y1 = np.maximum(rects.top, rects.top + rects.height - 1) // size
+        
+        # One (cell, index) pair per covered cell; rects rarely span more than 2x2 cells
+        index = np.arange(count)
+        cx, cy, entries = [], [], []
+        for dx in range(int((x1 - x0).max()) + 1):
+            for dy in range(int((y1 - y0).max()) + 1):
+                covered = (x0 + dx <= x1) & (y0 + dy <= y1)
+                cx.append(x0[covered] + dx)
+                cy.append(y0[covered] + dy)
+                entries.append(index[covered])
+        cx = np.concatenate(cx)
+        cy = np.concatenate(cy)
+        entries = np.concatenate(entries)
+        
+        # Group by cell with entity indices ascending inside each bucket, as insert() leaves them
+        rows = int(cy.max() - cy.min()) + 1
+        cell = (cx - cx.min()) * rows + (cy - cy.min())
+        order = np.argsort(cell * count + entries)
+        cell = cell[order]
+        starts = np.flatnonzero(np.diff(cell)) + 1
+        bounds = [0] + starts.tolist() + [len(cell)]
+        firsts = order[bounds[:-1]]
+        entries = entries[order].tolist()
+        cells = self.cells
+        for key, start, end in zip(zip(cx[firsts].tolist(), cy[firsts].tolist()), bounds, bounds[1:]):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = entries[start:end]
+            else:
+                bucket.extend(entries[start:end])
+    
+    def query(self, rect):
+        """Return the sorted indices of entities sharing at least one cell with rect"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), ())
+        
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+class GameManager:
+    """Main game manager handling game state, spawning, and collision detection"""
+    
+    # Plain values packed ahead of the entities in snapshots
+    STATE_VALUES = ("game_over", "score", "start_time", "last_meteor_spawn",
+                    "last_power_up_spawn", "meteor_spawn_rate", "power_up_spawn_rate",
+                    "power_ups_collected")
+    SNAPSHOT = struct.Struct("<q?qdddqqq")  # frame, then STATE_VALUES
+    state_getter = operator.attrgetter(*STATE_VALUES)
+    
+    def __init__(self, headless=False, input_source=None, clock=None, array_store=False,
+                 particles=None, starfield=None, dirty_rects=False, pool_sizes=None,
+                 seed=None, settings=None, profiler=None, tick_rate=None, swept_collisions=None,
+                 decoupled=False, render_fps=0, max_frame_skip=5, governor=None):
+        started = time.perf_counter()
+        self.headless = headless
+        self.input_source = input_source
+        self.recorder = None  # receives every frame's input bitmask (see replay.py)
+        self.spectator = None  # publishes every simulated frame (see spectator.py)
+        self.capture = None  # copies every presented frame (see capture.py)
+        self.restart_requested = False
+        self.sim_clock = clock if clock is not None else SimClock(1000 / (tick_rate or FPS))
+        
+        # Motion is tuned in pixels per 60 Hz frame; coarser ticks move further per step
+        self.step_scale = self.sim_clock.dt / (1000 / FPS)
+        self.motion = 1.0  # this step's movement multiplier, including time slow
+        if swept_collisions is None:
+            swept_collisions = self.step_scale > 1.0
+        self.swept_collisions = swept_collisions
+        
+        # Decoupled loop: fixed-rate simulation, rendering as fast as render_fps allows
+        self.decoupled = decoupled
+        self.render_fps = render_fps  # 0 renders uncapped
+        self.max_frame_skip = max_frame_skip  # simulation steps allowed per rendered frame
+        self.render_scale = 1.0  # time since the last rendered frame, in 60 Hz frames
+        self.previous_player_x = None
+        self.governor = governor  # QualityGovernor fed with each rendered frame's time
+        self.scheduler = TimerScheduler(self.sim_clock)
+        self.timer_handlers = {
+            "meteor_wave": self.spawn_meteors,
+            "power_up_drop": self.spawn_power_ups,
+            "power_up_expiry": self.expire_power_up,
+        }
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.settings = merge_settings(settings)
+        self.starfield = starfield if starfield is not None else Starfield()
+        self.hud = HudLayer()
+        self.dirty_renderer = DirtyRectRenderer() if dirty_rects else None
+        self.profiler = profiler  # FrameProfiler, or None for no timing overhead
+        
+        sizes = dict(DEFAULT_POOL_SIZES, **(pool_sizes or {}))
+        speed_ranges = self.settings["meteor_speed_ranges"]
+        
+        # Optional NumPy-backed storage for meteors and bullets
+        if array_store:
+            self.meteor_store = EntityStore(cull="below")
+            self.bullet_store = EntityStore(cull="outside")
+            self.meteor_store.on_remove = self.release_all
+            self.bullet_store.on_remove = self.release_all
+            meteor_pool = ObjectPool(ArrayMeteor, sizes["meteors"], store=self.meteor_store,
+                                     rng=self.rng, speed_ranges=speed_ranges)
+            bullet_pool = ObjectPool(ArrayBullet, sizes["bullets"], store=self.bullet_store)
+            laser_pool = ObjectPool(ArrayLaser, sizes["lasers"], store=self.bullet_store,
+                                    clock=self.sim_clock)
+        else:
+            self.meteor_store = None
+            self.bullet_store = None
+            meteor_pool = ObjectPool(Meteor, sizes["meteors"], rng=self.rng,
+                                     speed_ranges=speed_ranges)
+            bullet_pool = ObjectPool(Bullet, sizes["bullets"])
+            laser_pool = ObjectPool(LaserBeam, sizes["lasers"], clock=self.sim_clock)
+        
+        # Explosion particles share one batched engine whenever NumPy is available
+        if particles is None:
+            particles = np is not None
+        if particles:
+            self.particle_engine = ParticleEngine()
+            explosion_pool = ObjectPool(ParticleExplosion, sizes["explosions"],
+                                        engine=self.particle_engine, rng=self.rng)
+        else:
+            self.particle_engine = None
+            explosion_pool = ObjectPool(Explosion, sizes["explosions"], rng=self.rng)
+        
+        # Free-list pools; entities are released back to the pool of their class
+        self.pools = {
+            "meteors": meteor_pool,
+            "bullets": bullet_pool,
+            "lasers": laser_pool,
+            "power_ups": ObjectPool(PowerUp, sizes["power_ups"], rng=self.rng),
+            "explosions": explosion_pool,
+        }
+        self.pool_by_class = {pool.cls: pool for pool in self.pools.values()}
+        self.pool_tags = {pool.cls: tag for tag, pool in enumerate(self.pools.values())}
+        self.tagged_pools = list(self.pools.values())
+        self.make_meteor = meteor_pool.acquire
+        self.make_power_up = self.pools["power_ups"].acquire
+        self.make_explosion = explosion_pool.acquire
+        
+        if headless:
+            # No window, fonts or rendering - simulation only
+            self.screen = None
+        else:
+            init_display()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("2D Arcade Space Shooter")
+            if sprite_atlas.surface is None:
+                atlas_started = time.perf_counter()
+                sprite_atlas.build()
+                record_startup("sprite atlas", atlas_started)
+        self.clock = pygame.time.Clock()
+        
+        # Game state
+        self.running = True
+        self.game_over = False
+        self.score = 0
+        self.start_time = self.sim_clock.now
+        
+        # Game objects
+        self.player = self.create_player()
+        self.meteors = self.meteor_store.views if array_store else []
+        self.bullets = self.bullet_store.views if array_store else []
+        self.power_ups = []
+        self.explosions = []
+        
+        # Spawn timers
+        self.last_meteor_spawn = 0
+        self.last_power_up_spawn = 0
+        self.meteor_spawn_rate = int(self.settings["meteor_spawn_rate"])  # milliseconds
+        self.power_up_spawn_rate = self.rng.randint(8000, 12000)  # 8-12 seconds
+        self.schedule_spawns()
+        
+        # Balance statistics
+        self.power_ups_collected = 0
+        
+        # Collision broad phase, rebuilt from the meteor list every frame
+        self.collision_grid = SpatialHash()
+        record_startup("headless world" if headless else "world", started)
+    
+    def create_player(self):
+        """Create the player ship wired to this game's clock and entity storage"""
+        player = Player(SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT - 50, self.sim_clock)
+        player.make_bullet = self.pools["bullets"].acquire
+        player.make_laser = self.pools["lasers"].acquire
+        return player
+    
+    def release_all(self, entities):
+        """Return removed entities to their pools"""
+        pool_by_class = self.pool_by_class
+        for entity in entities:
+            pool = pool_by_class.get(type(entity))
+            if pool is not None:
+                pool.release(entity)
+    
+    def remove_dead(self, entities, store, dead):
+        """Remove entities flagged in dead from a game list in one pass, keeping list order"""
+        if store is not None:
+            store.remove(dead)
+            return
+        
+        alive = []
+        removed = []
+        for entity, flag in zip(entities, dead):
+            (removed if flag else alive).append(entity)
+        entities[:] = alive
+        self.release_all(removed)
+    
+    def compact(self, entities, is_dead):
+        """Drop entities for which is_dead(entity) is true and return them to their pools"""
+        alive = []
+        removed = []
+        for entity in entities:
+            (removed if is_dead(entity) else alive).append(entity)
+        if removed:
+            entities[:] = alive
+            self.release_all(removed)
+    
+    def pool_stats(self):
+        """Return size and peak-usage counters for every entity pool"""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+    
+    def handle_events(self):
+        """Handle pygame events"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_r and self.game_over:
+                    self.restart_requested = True
+                elif event.key == pygame.K_F3:
+                    if self.profiler is None:
+                        self.profiler = FrameProfiler()
+                    self.profiler.toggle_overlay()
+    
+    def handle_input(self, bits=None):
+        """Handle continuous keyboard input"""
+        if not self.game_over:
+            if bits is None:
+                bits = self.read_input()
+            
+            # Player movement
+            if bits & INPUT_LEFT:
+                self.player.move("left", self.step_scale)
+            if bits & INPUT_RIGHT:
+                self.player.move("right", self.step_scale)
+            
+            # Shooting
+            if bits & INPUT_SHOOT:
+                bullets = self.player.shoot()
+                if bullets:
+                    self.bullets.extend(bullets)
+    
+    def read_input(self):
+        """Return this frame's input bitmask from the input source or keyboard"""
+        if self.input_source is not None:
+            return self.input_source.next_input()
+        if not pygame.display.get_init():
+            return 0  # no window, so no keys can be held
+        
+        keys = pygame.key.get_pressed()
+        bits = 0
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            bits |= INPUT_LEFT
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            bits |= INPUT_RIGHT
+        if keys[pygame.K_SPACE]:
+            bits |= INPUT_SHOOT
+        if self.restart_requested:
+            bits |= INPUT_RESTART
+            self.restart_requested = False
+        return bits
+    
+    def schedule_spawns(self):
+        """Queue the next meteor wave and power-up drop from the last spawn times"""
+        scheduler = self.scheduler
+        scheduler.schedule_after(self.last_meteor_spawn, self.meteor_spawn_rate,
+                                 "meteor_wave", order=0)
+        scheduler.schedule_after(self.last_power_up_spawn, self.power_up_spawn_rate,
+                                 "power_up_drop", order=1)
+    
+    def run_timers(self):
+        """Run every scheduled event that is due this frame"""
+        handlers = self.timer_handlers
+        for kind, data in self.scheduler.pop_due():
+            handlers[kind](*data)
+    
+    def spawn_meteors(self):
+        """Spawn a meteor wave and schedule the next one"""
+        current_time = self.sim_clock.now
+        self.last_meteor_spawn = current_time
+        
+        # Spawn 1-2 meteors
+        for _ in range(self.rng.randint(1, 2)):
+            x = self.rng.randint(0, SCREEN_WIDTH - 40)
+            size_type = self.rng.choice(["large", "large", "small"])  # 2:1 ratio
+            self.meteors.append(self.make_meteor(x, -50, size_type))
+        
+        # Gradually increase spawn rate (decrease interval)
+        if self.meteor_spawn_rate > 400:
+            self.meteor_spawn_rate -= 10
+        self.scheduler.schedule_after(current_time, self.meteor_spawn_rate, "meteor_wave", order=0)
+    
+    def spawn_power_ups(self):
+        """Drop a power-up and schedule the next drop"""
+        current_time = self.sim_clock.now
+        self.last_power_up_spawn = current_time
+        self.power_up_spawn_rate = self.rng.randint(8000, 12000)  # Reset timer
+        
+        x = self.rng.randint(0, SCREEN_WIDTH - 25)
+        self.power_ups.append(self.make_power_up(x, -30))
+        self.scheduler.schedule_after(current_time, self.power_up_spawn_rate, "power_up_drop", order=1)
+    
+    def activate_power_up(self, power_type):
+        """Switch a power-up effect on and schedule its expiry"""
+        attribute = POWER_UP_TYPES[power_type][0]
+        current_time = self.sim_clock.now
+        setattr(self.player, attribute, True)
+        setattr(self.player, attribute + "_timer", current_time)
+        
+        # Re-collecting restarts the timer; the earlier expiry then finds a newer token
+        self.scheduler.schedule_after(current_time, self.settings["power_up_durations"][power_type],
+                                      "power_up_expiry", attribute, current_time, order=2)
+    
+    def expire_power_up(self, attribute, token):
+        """Switch an effect off unless it was re-activated since this expiry was scheduled"""
+        if getattr(self.player, attribute + "_timer") == token:
+            setattr(self.player, attribute, False)
+    
+    def update_game_objects(self):
+        """Update all game objects"""
+        if not self.game_over:
+            time_slow = self.player.time_slow
+            scale = self.step_scale
+            self.motion = (0.3 if time_slow else 1.0) * scale
+            
+            # Update bullets. Swept collisions test the path a bullet takes off the
+            # screen, so there it is culled a step later, by where that step left it
+            if self.swept_collisions:
+                if self.bullet_store is not None:
+                    self.bullet_store.remove_off_screen(self.sim_clock.now)
+                    self.bullet_store.move(self.motion)
+                else:
+                    self.compact(self.bullets, OFF_SCREEN)
+                    for bullet in self.bullets:
+                        bullet.update(time_slow, scale)
+            elif self.bullet_store is not None:
+                self.bullet_store.update(self.motion, self.sim_clock.now)
+            else:
+                for bullet in self.bullets:
+                    bullet.update(time_slow, scale)
+                self.compact(self.bullets, OFF_SCREEN)
+            
+            # Update meteors
+            if self.meteor_store is not None:
+                self.meteor_store.update(self.motion, self.sim_clock.now)
+            else:
+                for meteor in self.meteors:
+                    meteor.update(time_slow, scale)
+                self.compact(self.meteors, OFF_SCREEN)
+            
+            # Update power-ups
+            for power_up in self.power_ups:
+                power_up.update(scale)
+            self.compact(self.power_ups, OFF_SCREEN)
+        
+        # Update explosions (always)
+        if self.particle_engine is not None:
+            self.particle_engine.update(self.step_scale)
+        for explosion in self.explosions:
+            explosion.update(self.step_scale)
+        self.compact(self.explosions, FINISHED)
+    
+    def check_collisions(self):
+        """Check all collision detection"""
+        if self.game_over:
+            return
+        
+        player_rect = self.player.get_rect()
+        
+        # Bucket meteors by grid cell once per frame; rects are built only once per meteor
+        meteors = self.meteors
+        grid = self.collision_grid
+        grid.clear()
+        if self.meteor_store is not None:
+            # Straight from the store's columns; a Rect is built only for a candidate hit
+            meteor_rects = StoreRects(self.meteor_store)
+            grid.insert_columns(meteor_rects)
+        else:
+            meteor_rects = [meteor.get_rect() for meteor in meteors]
+            for index, rect in enumerate(meteor_rects):
+                grid.insert(index, rect)
+        destroyed = [False] * len(meteors)
+        
+        # Laser-meteor collisions: a beam destroys every meteor in its column
+        lasers = [bullet for bullet in self.bullets if bullet.continuous]
+        if meteors and lasers:
+            if self.meteor_store is not None:
+                column_index = ColumnIndex.from_columns(meteor_rects)
+            else:
+                column_index = ColumnIndex(meteor_rects)
+            for laser in lasers:
+                for index in column_index.query(laser.get_rect()):
+                    if not destroyed[index]:
+                        self.destroy_meteor(meteors[index])
+                        destroyed[index] = True
+        
+        # Bullet-meteor collisions: each bullet hits the first nearby meteor in list order
+        if meteors and len(self.bullets) > len(lasers) and self.swept_collisions:
+            self.check_swept_bullet_hits(meteor_rects, destroyed)
+        elif meteors and len(self.bullets) > len(lasers):
+            spent = [False] * len(self.bullets)
+            for bullet_index, bullet in enumerate(self.bullets):
+                if bullet.continuous:
+                    continue
+                bullet_rect = bullet.get_rect()
+                for index in grid.query(bullet_rect):
+                    if destroyed[index] or not bullet_rect.colliderect(meteor_rects[index]):
+                        continue
+                    
+                    self.destroy_meteor(meteors[index])
+                    destroyed[index] = True
+                    spent[bullet_index] = True
                     break
+            if True in spent:
+                self.remove_dead(self.bullets, self.bullet_store, spent)
         
         # Player-meteor collisions
         if not self.player.invincible:
-            for meteor in self.meteors[:]:
-                if self.player.get_rect().colliderect(meteor.get_rect()):
-                    # Create explosion
-                    self.explosions.append(Explosion(self.player.x + self.player.width // 2,
-                                                   self.player.y + self.player.height // 2,
-                                                   "large"))
-                    
-                    # Remove meteor and reduce life
-                    self.meteors.remove(meteor)
-                    self.player.lives -= 1
-                    
-                    # Brief invincibility after hit
-                    self.player.invincible = True
-                    self.player.invincible_timer = pygame.time.get_ticks()
-                    
-                    if self.player.lives <= 0:
-                        self.game_over = True
-                    break
+            for index in grid.query(player_rect):
+                if destroyed[index] or not player_rect.colliderect(meteor_rects[index]):
+                    continue
+                
+                # Create explosion
+                self.explosions.append(self.make_explosion(self.player.x + self.player.width // 2,
+                                               self.player.y + self.player.height // 2,
+                                               "large"))
+                
+                # Remove meteor and reduce life
+                destroyed[index] = True
+                self.player.lives -= 1
+                
+                # Brief invincibility after hit
+                self.activate_power_up("shield")
+                
+                if self.player.lives <= 0:
+                    self.game_over = True
+                break
+        
+        # Remove destroyed meteors in a single pass
+        if True in destroyed:
+            self.remove_dead(self.meteors, self.meteor_store, destroyed)
         
         # Player-power-up collisions
-        for power_up in self.power_ups[:]:
-            if self.player.get_rect().colliderect(power_up.get_rect()):
+        for index, power_up in enumerate(self.power_ups):
+            if player_rect.colliderect(power_up.get_rect()):
                 # Apply power-up effect
-                current_time = pygame.time.get_ticks()
-                
-                if power_up.type == "rapid_fire":
-                    self.player.rapid_fire = True
-                    self.player.rapid_fire_timer = current_time
-                elif power_up.type == "shield":
-                    self.player.invincible = True
-                    self.player.invincible_timer = current_time
-                elif power_up.type == "double_score":
-                    self.player.double_score = True
-                    self.player.double_score_timer = current_time
-                elif power_up.type == "triple_shot":
-                    self.player.triple_shot = True
-                    self.player.triple_shot_timer = current_time
-                elif power_up.type == "laser_beam":
-                    self.player.laser_beam = True
-                    self.player.laser_beam_timer = current_time
-                elif power_up.type == "time_slow":
-                    self.player.time_slow = True
-                    self.player.time_slow_timer = current_time
-                elif power_up.type == "mega_bullets":
-                    self.player.mega_bullets = True
-                    self.player.mega_bullets_timer = current_time
+                self.activate_power_up(power_up.type)
                 
                 # Remove power-up
-                self.power_ups.remove(power_up)
+                self.power_ups_collected += 1
+                del self.power_ups[index]
+                self.release_all([power_up])
                 break
     
+    def check_swept_bullet_hits(self, meteor_rects, destroyed):
+        """Bullet-meteor hits along this step's motion, resolved earliest time of impact first
+        
+        Start positions are derived from velocity, so fast bullets cannot pass
+        through small meteors between coarse ticks. A pair overlapping at the
+        end of the step always counts, exactly as in the discrete test.
+        """
+        meteors = self.meteors
+        bullets = self.bullets
+        motion = self.motion
+        grid = self.collision_grid
+        fall = max(high for _, high in self.settings["meteor_speed_ranges"].values()) * motion
+        
+        hits = []
+        for bullet_index, bullet in enumerate(bullets):
+            if bullet.continuous:
+                continue
+            dx = bullet.vx * motion
+            dy = bullet.vy * motion
+            start_x = bullet.x - dx
+            start_y = bullet.y - dy
+            end_rect = bullet.get_rect()
+            
+            # Broad phase: the bullet's swept box, stretched down by the farthest a meteor falls
+            area = end_rect.union(pygame.Rect(start_x, start_y, bullet.width, bullet.height))
+            area.height += int(fall) + 2
+            for index in grid.query(area):
+                if destroyed[index]:
+                    continue
+                meteor = meteors[index]
+                meteor_dy = meteor.speed * motion
+                toi = sweep_time(start_x, start_y, bullet.width, bullet.height, dx, dy - meteor_dy,
+                                 meteor.x, meteor.y - meteor_dy, meteor.width, meteor.height)
+                if end_rect.colliderect(meteor_rects[index]):
+                    toi = 1.0 if toi is None else toi
+                if toi is not None:
+                    hits.append((toi, bullet_index, index))
+        
+        hits.sort()
+        spent = [False] * len(bullets)
+        for _, bullet_index, index in hits:
+            if spent[bullet_index] or destroyed[index]:
+                continue
+            self.destroy_meteor(meteors[index])
+            destroyed[index] = True
+            spent[bullet_index] = True
+        if True in spent:
+            self.remove_dead(bullets, self.bullet_store, spent)
+    
+    def destroy_meteor(self, meteor):
+        """Explode a meteor and award its points"""
+        # Create explosion
+        self.explosions.append(self.make_explosion(meteor.x + meteor.width // 2, 
+                                                   meteor.y + meteor.height // 2, 
+                                                   meteor.size_type))
+        
+        # Award points
+        points = meteor.points
+        if self.player.double_score:
+            points *= 2
+        self.score += points
+    
     def get_remaining_time(self):
         """Calculate remaining game time"""
-        elapsed = time.time() - self.start_time
+        elapsed = (self.sim_clock.now - self.start_time) / 1000
         remaining = max(0, GAME_DURATION - elapsed)
         return remaining
     
@@ -660,48 +2733,13 @@ class GameManager:
     
     def draw_hud(self):
         """Draw heads-up display"""
-        # Score
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
-        
-        # Lives as hearts
-        lives_label = self.font.render("Lives:", True, WHITE)
-        self.screen.blit(lives_label, (10, 50))
-        
-        # Draw hearts
-        heart_x = 90
-        for i in range(3):
-            filled = i < self.player.lives
-            self.draw_heart(self.screen, heart_x + i * 30, 55, 20, filled)
-        
-        # Timer
-        remaining_time = self.get_remaining_time()
-        time_text = self.font.render(f"Time: {int(remaining_time)}s", True, WHITE)
-        self.screen.blit(time_text, (SCREEN_WIDTH - 150, 10))
-        
-        # Power-up indicators
-        y_offset = 90
-        active_powers = []
-        
-        if self.player.rapid_fire:
-            active_powers.append(("RAPID FIRE", RED))
-        if self.player.invincible:
-            active_powers.append(("SHIELD", CYAN))
-        if self.player.double_score:
-            active_powers.append(("DOUBLE SCORE", GREEN))
-        if self.player.triple_shot:
-            active_powers.append(("TRIPLE SHOT", PURPLE))
-        if self.player.laser_beam:
-            active_powers.append(("LASER BEAM", (255, 0, 255)))
-        if self.player.time_slow:
-            active_powers.append(("TIME SLOW", (0, 255, 255)))
-        if self.player.mega_bullets:
-            active_powers.append(("MEGA BULLETS", ORANGE))
-        
-        for power_name, color in active_powers:
-            power_text = self.small_font.render(power_name, True, color)
-            self.screen.blit(power_text, (10, y_offset))
-            y_offset += 25
+        self.hud.draw(self.screen, self)
+    
+    def active_power_labels(self):
+        """Return (label, colour) pairs for the player's active power-ups"""
+        player = self.player
+        return [(label, color) for attribute, _, color, label in POWER_UP_TYPES.values()
+                if getattr(player, attribute)]
     
     def draw_game_over(self):
         """Draw game over screen"""
@@ -712,17 +2750,17 @@ class GameManager:
         self.screen.blit(overlay, (0, 0))
         
         # Game Over text
-        game_over_text = self.font.render("GAME OVER", True, WHITE)
+        game_over_text = text_cache.render("GAME OVER", WHITE)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(game_over_text, game_over_rect)
         
         # Final score
-        final_score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
+        final_score_text = text_cache.render(f"Final Score: {self.score}", WHITE)
         final_score_rect = final_score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(final_score_text, final_score_rect)
         
         # Restart instruction
-        restart_text = self.small_font.render("Press R to restart or ESC to quit", True, WHITE)
+        restart_text = text_cache.render("Press R to restart or ESC to quit", WHITE, 24)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(restart_text, restart_rect)
     
@@ -730,48 +2768,213 @@ class GameManager:
         """Restart the game"""
         self.game_over = False
         self.score = 0
-        self.start_time = time.time()
+        self.start_time = self.sim_clock.now
         
         # Reset player
-        self.player = Player(SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT - 50)
+        self.player = self.create_player()
         
-        # Clear all objects
-        self.meteors.clear()
-        self.bullets.clear()
-        self.power_ups.clear()
-        self.explosions.clear()
+        # Clear all objects, returning them to their pools
+        self.clear_entities()
         
         # Reset spawn timers
         self.last_meteor_spawn = 0
         self.last_power_up_spawn = 0
-        self.meteor_spawn_rate = 1000
-        self.power_up_spawn_rate = random.randint(8000, 12000)
+        self.meteor_spawn_rate = int(self.settings["meteor_spawn_rate"])
+        self.power_up_spawn_rate = self.rng.randint(8000, 12000)
+        self.scheduler.clear()
+        self.schedule_spawns()
+        self.power_ups_collected = 0
+    
+    def entity_groups(self):
+        """Return each entity list paired with the EntityStore backing it, if any"""
+        return ((self.meteors, self.meteor_store), (self.bullets, self.bullet_store),
+                (self.power_ups, None), (self.explosions, None))
+    
+    def clear_entities(self):
+        """Return every meteor, bullet, power-up and explosion to its pool"""
+        for entities, store in self.entity_groups():
+            if store is not None:
+                store.clear()
+            else:
+                self.release_all(entities)
+                entities.clear()
+        if self.particle_engine is not None:
+            self.particle_engine.clear()
     
-    def draw(self):
-        """Draw all game objects"""
-        # Clear screen
-        self.screen.fill(BLACK)
+    def snapshot(self):
+        """Pack the whole simulation state into a compact binary buffer for restore_snapshot()
         
-        # Draw stars background
-        for _ in range(50):
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT)
-            pygame.draw.circle(self.screen, WHITE, (x, y), 1)
+        Configuration - settings, tick rate and entity storage - is not included;
+        restore into a game created with the same options.
+        """
+        out = bytearray(self.SNAPSHOT.pack(self.sim_clock.frame, *self.state_getter(self)))
+        self.player.pack_state(out)
+        version, words, gauss = self.rng.getstate()
+        out += RNG_STATE.pack(*words, gauss is not None, gauss or 0.0)
+        self.scheduler.pack_state(out)
         
-        # Draw game objects
-        self.player.draw(self.screen)
+        pool_tags = self.pool_tags
+        for entities, store in self.entity_groups():
+            out += COUNT.pack(len(entities))
+            for entity in entities:
+                out.append(pool_tags[type(entity)])
+                entity.pack_state(out)
+            if store is not None:
+                store.pack_state(out)
+        if self.particle_engine is not None:
+            self.particle_engine.pack_state(out)
+        return bytes(out)
+    
+    def restore_snapshot(self, data):
+        """Return the simulation to a buffer taken by snapshot(); buffers are reusable"""
+        values = self.SNAPSHOT.unpack_from(data)
+        self.sim_clock.frame = values[0]
+        for name, value in zip(self.STATE_VALUES, values[1:]):
+            setattr(self, name, value)
+        offset = self.player.unpack_state(data, self.SNAPSHOT.size)
+        state = RNG_STATE.unpack_from(data, offset)
+        self.rng.setstate((3, state[:625], state[626] if state[625] else None))
+        offset = self.scheduler.unpack_state(data, offset + RNG_STATE.size)
+        
+        # Entities are restored into pooled objects; a store then refills the
+        # rows of its views column by column
+        self.clear_entities()
+        tagged_pools = self.tagged_pools
+        for entities, store in self.entity_groups():
+            (count,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            for _ in range(count):
+                entity = tagged_pools[data[offset]].take()
+                offset = entity.unpack_state(data, offset + 1)
+                entities.append(entity)
+            if store is not None:
+                offset = store.unpack_state(data, offset)
+        if self.particle_engine is not None:
+            self.particle_engine.unpack_state(data, offset)
+    
+    def shift_back(self, fraction):
+        """Move moving entities back by a fraction of the last step for interpolated drawing
+        
+        Earlier positions are derived from velocity; only the player's is stored.
+        Returns the exact current positions for restore_positions().
+        """
+        steps = fraction * self.motion
+        saved = {"player": self.player.x}
+        if self.previous_player_x is not None:
+            self.player.x -= (self.player.x - self.previous_player_x) * fraction
+        
+        if self.meteor_store is not None:
+            saved["meteor_store"] = self.meteor_store.shift_back(steps)
+        else:
+            saved["meteors"] = [(meteor, meteor.y, meteor.rotation) for meteor in self.meteors]
+            for meteor in self.meteors:
+                meteor.y -= meteor.speed * steps
+                meteor.rotation -= meteor.rotation_speed * steps
+        
+        if self.bullet_store is not None:
+            saved["bullet_store"] = self.bullet_store.shift_back(steps)
+        else:
+            saved["bullets"] = [(bullet, bullet.x, bullet.y) for bullet in self.bullets
+                                if not bullet.continuous]
+            for bullet, _, _ in saved["bullets"]:
+                bullet.x -= bullet.vx * steps
+                bullet.y -= bullet.vy * steps
+        
+        saved["power_ups"] = [(power_up, power_up.y) for power_up in self.power_ups]
+        for power_up in self.power_ups:
+            power_up.y -= power_up.speed * fraction * self.step_scale
+        return saved
+    
+    def restore_positions(self, saved):
+        """Put every entity back where shift_back() found it"""
+        self.player.x = saved["player"]
+        if "meteor_store" in saved:
+            self.meteor_store.restore_positions(saved["meteor_store"])
+        else:
+            for meteor, y, rotation in saved["meteors"]:
+                meteor.y = y
+                meteor.rotation = rotation
+        if "bullet_store" in saved:
+            self.bullet_store.restore_positions(saved["bullet_store"])
+        else:
+            for bullet, x, y in saved["bullets"]:
+                bullet.x = x
+                bullet.y = y
+        for power_up, y in saved["power_ups"]:
+            power_up.y = y
+    
+    def get_draw_rects(self):
+        """Return the screen areas every entity and the HUD draw into this frame"""
+        rects = [self.player.get_draw_rect()]
+        for group in (self.bullets, self.meteors, self.power_ups):
+            rects.extend(entity.get_draw_rect() for entity in group)
+        for explosion in self.explosions:
+            rect = explosion.get_draw_rect()
+            if rect is not None:
+                rects.append(rect)
+        rects.extend(self.hud.get_draw_rects(self))
+        if self.profiler is not None and self.profiler.overlay_visible:
+            rects.append(self.profiler.OVERLAY_RECT.copy())
+        return rects
+    
+    def draw_entities(self, screen):
+        """Draw the player, projectiles, meteors, power-ups and explosions in one batched blit"""
+        profiler = self.profiler
+        blits = []
+        self.player.add_blits(blits)
+        if profiler is not None:
+            profiler.mark("draw.player")
         
         for bullet in self.bullets:
-            bullet.draw(self.screen)
+            bullet.add_blits(blits)
+        if profiler is not None:
+            profiler.mark("draw.bullets")
         
         for meteor in self.meteors:
-            meteor.draw(self.screen)
+            meteor.add_blits(blits)
+        if profiler is not None:
+            profiler.mark("draw.meteors")
         
         for power_up in self.power_ups:
-            power_up.draw(self.screen)
+            power_up.add_blits(blits)
+        if profiler is not None:
+            profiler.mark("draw.power_ups")
         
-        for explosion in self.explosions:
-            explosion.draw(self.screen)
+        if self.particle_engine is not None:
+            self.particle_engine.add_blits(blits)
+        else:
+            for explosion in self.explosions:
+                explosion.add_blits(blits)
+        if profiler is not None:
+            profiler.mark("draw.explosions")
+        
+        screen.blits(blits, False)
+        if profiler is not None:
+            profiler.mark("draw.blits")
+    
+    def draw(self, alpha=1.0):
+        """Draw all game objects, alpha of the way from the previous simulation step to the latest"""
+        if alpha < 1.0 and not self.game_over:
+            saved = self.shift_back(1.0 - alpha)
+            self.draw(1.0)
+            self.restore_positions(saved)
+            return
+        
+        if self.dirty_renderer is not None:
+            self.dirty_renderer.draw(self)
+            if self.capture is not None:
+                self.capture_frame()
+            return
+        
+        profiler = self.profiler
+        
+        # Scrolling star layers also clear the screen
+        self.starfield.draw(self.screen, scale=self.render_scale)
+        if profiler is not None:
+            profiler.mark("draw.background")
+        
+        # Draw game objects
+        self.draw_entities(self.screen)
         
         # Draw HUD
         self.draw_hud()
@@ -779,32 +2982,354 @@ class GameManager:
         # Draw game over screen if needed
         if self.game_over:
             self.draw_game_over()
+        if profiler is not None:
+            profiler.mark("draw.hud")
+            profiler.draw_overlay(self.screen)
         
         pygame.display.flip()
+        if profiler is not None:
+            profiler.mark("draw.present")
+        if self.capture is not None:
+            self.capture_frame()
+    
+    def capture_frame(self):
+        """Hand the frame just presented to the frame capture"""
+        self.capture.capture(self.screen)
+        if self.profiler is not None:
+            self.profiler.mark("draw.capture")
+    
+    def step(self):
+        """Advance the game simulation by one frame"""
+        profiler = self.profiler
+        bits = self.read_input()
+        if self.recorder is not None:
+            self.recorder.record(bits)
+        if bits & INPUT_RESTART and self.game_over:
+            self.restart_game()
+        self.previous_player_x = self.player.x
+        self.handle_input(bits)
+        if profiler is not None:
+            profiler.mark("input")
+        
+        if not self.game_over:
+            self.run_timers()
+        if profiler is not None:
+            profiler.mark("timers")
+        
+        self.update_game_objects()
+        if profiler is not None:
+            profiler.mark("update")
+        self.check_collisions()
+        if profiler is not None:
+            profiler.mark("collisions")
+        self.check_game_over()
+        
+        self.sim_clock.advance()
+        if profiler is not None:
+            profiler.mark("game_over")
+        if self.spectator is not None:
+            self.spectator.publish(self)
+            if profiler is not None:
+                profiler.mark("spectate")
     
     def run(self):
         """Main game loop"""
+        if self.headless:
+            return self.run_headless()
+        if self.decoupled:
+            return self.run_decoupled()
+        
         while self.running:
+            frame_start = time.perf_counter()
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
             self.handle_events()
-            self.handle_input()
+            if profiler is not None:
+                profiler.mark("events")
+            self.step()
+            self.draw()
+            if profiler is not None:
+                profiler.end_frame(self)
+            if self.governor is not None:
+                self.governor.observe((time.perf_counter() - frame_start) * 1000)
             
-            if not self.game_over:
-                self.spawn_meteors()
-                self.spawn_power_ups()
+            self.clock.tick(1000 / self.sim_clock.dt)
+        
+        pygame.quit()
+    
+    def run_decoupled(self):
+        """Game loop with a fixed-rate simulation and interpolated rendering
+        
+        Real time accumulates between rendered frames and is spent in fixed
+        simulation steps. A slow machine runs several steps per rendered frame,
+        up to max_frame_skip, so gameplay keeps its speed; a fast one renders
+        in-between states.
+        """
+        dt = self.sim_clock.dt
+        frame_ms = 1000 / FPS
+        accumulator = 0.0
+        previous = time.perf_counter()
+        
+        while self.running:
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+            now = time.perf_counter()
+            elapsed = (now - previous) * 1000
+            previous = now
+            accumulator += elapsed
+            self.render_scale = elapsed / frame_ms
             
-            self.update_game_objects()
-            self.check_collisions()
-            self.check_game_over()
-            self.draw()
+            self.handle_events()
+            if profiler is not None:
+                profiler.mark("events")
+            steps = 0
+            while accumulator >= dt and steps < self.max_frame_skip:
+                self.step()
+                accumulator -= dt
+                steps += 1
+            if accumulator >= dt:
+                # Too far behind to catch up: drop the backlog rather than spiral
+                accumulator %= dt
             
-            self.clock.tick(FPS)
+            self.draw(accumulator / dt)
+            if profiler is not None:
+                profiler.end_frame(self)
+            if self.governor is not None:
+                self.governor.observe((time.perf_counter() - now) * 1000)
+            self.clock.tick(self.render_fps)
         
         pygame.quit()
+    
+    def run_headless(self, max_frames=None):
+        """Step the simulation as fast as possible without rendering"""
+        frames = 0
+        peaks = {"meteors": 0, "bullets": 0, "power_ups": 0, "explosions": 0}
+        start = time.perf_counter()
+        
+        while self.running and not self.game_over:
+            if max_frames is not None and frames >= max_frames:
+                break
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+                self.step()
+                profiler.end_frame(self)
+            else:
+                self.step()
+            frames += 1
+            
+            # Track peak entity counts
+            for name in peaks:
+                count = len(getattr(self, name))
+                if count > peaks[name]:
+                    peaks[name] = count
+        
+        elapsed = time.perf_counter() - start
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        return {
+            "frames": frames,
+            "elapsed": elapsed,
+            "fps": fps,
+            "score": self.score,
+            "lives_lost": 3 - self.player.lives,
+            "power_ups_collected": self.power_ups_collected,
+            "peaks": peaks,
+        }
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+    parser = argparse.ArgumentParser(description="2D Arcade Space Shooter")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a window using scripted input")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="stop a headless run after this many frames")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the random number generator")
+    parser.add_argument("--tick-rate", type=int, default=FPS,
+                        help="simulation steps per second (default: 60); coarser rates "
+                             "switch bullet hits to swept collision tests")
+    parser.add_argument("--meteor-angle-steps", type=int, default=72,
+                        help="number of cached rotation angles per meteor sprite")
+    parser.add_argument("--star-layers", type=int, default=3,
+                        help="number of parallax starfield layers")
+    parser.add_argument("--star-density", type=int, default=60,
+                        help="total number of background stars")
+    parser.add_argument("--decoupled", action="store_true",
+                        help="simulate at the fixed tick rate and render as fast as possible, "
+                             "interpolating between simulation steps")
+    parser.add_argument("--render-fps", type=int, default=0,
+                        help="with --decoupled, cap the render rate (default: uncapped)")
+    parser.add_argument("--max-frame-skip", type=int, default=5,
+                        help="with --decoupled, simulation steps allowed per rendered frame")
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="cut visual detail in stages when frames run over budget")
+    parser.add_argument("--frame-budget", type=float, default=1000 / FPS,
+                        help="with --adaptive-quality, target milliseconds per frame")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw only changed screen regions over a static background")
+    parser.add_argument("--pool-stats", action="store_true",
+                        help="print entity pool usage after a headless run")
+    parser.add_argument("--array-store", action="store_true",
+                        help="keep meteors and bullets in NumPy arrays (requires NumPy)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="write every frame's input to a replay file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a replay file instead of reading input")
+    parser.add_argument("--seek", type=int, default=0,
+                        help="with --replay, fast-forward to this frame before showing it")
+    parser.add_argument("--profile", metavar="PATH", nargs="?", const="",
+                        help="time every frame phase (F3 shows the graph); write a "
+                             "Chrome trace (.json) or CSV (.csv) to PATH on exit")
+    parser.add_argument("--startup-times", action="store_true",
+                        help="print how long importing and each startup stage took")
+    parser.add_argument("--spectate", metavar="ADDRESS",
+                        help="broadcast every frame to viewers on tcp:HOST:PORT or unix:PATH "
+                             "(watch with: python spectator.py watch ADDRESS)")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="record every presented frame: PATH.raw for raw frames, a pattern "
+                             "like frames/%%05d.png for PNGs, or a video file encoded by ffmpeg; "
+                             "with --decoupled, --render-fps sets the video frame rate")
+    parser.add_argument("--capture-command", metavar="COMMAND",
+                        help="encoder command for --capture to a video file; may use {path}, "
+                             "{width}, {height}, {fps} and {pixel_format}")
+    parser.add_argument("--capture-ring", type=int, default=8,
+                        help="frame buffers the capture writer may fall behind by before "
+                             "frames are dropped (default: 8)")
+    args = parser.parse_args(argv)
+    if args.capture and args.headless:
+        parser.error("--capture needs a window; it cannot be combined with --headless")
+    if args.array_store and np is None:
+        parser.error("--array-store needs NumPy: pip install numpy")
+    if args.capture and args.decoupled and not args.render_fps:
+        parser.error("--capture with --decoupled needs --render-fps; "
+                     "the video's frame rate is the render cap")
+    return args
+
+def report_profile(profiler, path):
+    """Print per-phase percentiles and export the frame history if a path was given"""
+    if profiler is None or not profiler.frames:
+        return
+    print(f"{'phase':<18}{'p50':>8}{'p95':>8}{'p99':>8}  ms over the last {profiler.window} frames")
+    for phase, (p50, p95, p99) in profiler.summary().items():
+        print(f"{phase:<18}{p50:8.3f}{p95:8.3f}{p99:8.3f}")
+    if path:
+        profiler.export(path)
+        print(f"Wrote {len(profiler.history)} profiled frames to {path}")
 
-def main():
+def report_startup():
+    """Print the time taken by every startup stage so far"""
+    for stage, ms in startup_times.items():
+        print(f"{stage:<18}{ms:8.2f} ms")
+
+def main(argv=None):
     """Main function to start the game"""
-    game = GameManager()
-    game.run()
+    args = parse_args(argv)
+    profiler = FrameProfiler() if args.profile is not None else None
+    spectator = None
+    if args.spectate:
+        from spectator import SpectatorServer
+        spectator = SpectatorServer(args.spectate).start()
+    try:
+        run_game(args, profiler, spectator)
+    finally:
+        if spectator is not None:
+            spectator.close()
+
+def run_windowed(game, args):
+    """Run a windowed game, capturing its frames if --capture was given"""
+    if args.capture:
+        from capture import FrameCapture
+        # Frames are stamped at the rate the loop is capped to (parse_args requires a
+        # cap when decoupled); a machine that cannot keep up yields a faster video
+        fps = args.render_fps if game.decoupled else round(1000 / game.sim_clock.dt)
+        game.capture = FrameCapture(args.capture, game.screen, ring_size=args.capture_ring, fps=fps,
+                                    command=args.capture_command)
+    try:
+        game.run()
+    finally:
+        if game.capture is not None:
+            game.capture.close()
+            print(game.capture.describe())
+
+def run_game(args, profiler, spectator):
+    """Build the game the command line asks for and run it"""
+    if args.replay:
+        from replay import ReplayPlayer
+        player = ReplayPlayer(args.replay)
+        if args.headless:
+            game = player.new_game(array_store=args.array_store, profiler=profiler)
+            game.spectator = spectator
+            start = time.perf_counter()
+            player.fast_forward(args.frames if args.frames is not None else player.frames)
+            print(f"Replayed {game.sim_clock.frame} of {player.frames} frames in "
+                  f"{time.perf_counter() - start:.3f}s, score {game.score}")
+            pygame.quit()
+            return
+        meteor_sprites.set_angle_steps(args.meteor_angle_steps)
+        game = player.new_game(headless=False, array_store=args.array_store,
+                               starfield=Starfield(layers=args.star_layers, density=args.star_density),
+                               dirty_rects=args.dirty_rects, profiler=profiler)
+        player.seek(args.seek)
+        game.spectator = spectator
+        meteor_sprites.prerender()
+        run_windowed(game, args)
+        report_profile(game.profiler, args.profile)
+        return
+    
+    recorder = None
+    if args.record:
+        from replay import InputRecorder
+        if args.seed is None:
+            args.seed = random.randrange(2 ** 32)
+        recorder = InputRecorder(args.record, args.seed, tick_rate=args.tick_rate)
+    
+    if args.headless:
+        game = GameManager(headless=True, input_source=ScriptedInput(SWEEP_SCRIPT),
+                           array_store=args.array_store, seed=args.seed, profiler=profiler,
+                           tick_rate=args.tick_rate)
+        game.recorder = recorder
+        game.spectator = spectator
+        if args.startup_times:
+            report_startup()
+        stats = game.run_headless(args.frames)
+        if recorder is not None:
+            print(f"Recorded {recorder.frames} frames to {args.record} ({recorder.close()} bytes)")
+        print(f"Simulated {stats['frames']} frames in {stats['elapsed']:.3f}s "
+              f"({stats['fps']:.0f} FPS), score {stats['score']}")
+        if args.pool_stats:
+            for name, pool in game.pool_stats().items():
+                print(f"  {name}: {pool}")
+        report_profile(profiler, args.profile)
+        pygame.quit()
+        return
+    
+    meteor_sprites.set_angle_steps(args.meteor_angle_steps)
+    starfield = Starfield(layers=args.star_layers, density=args.star_density)
+    governor = QualityGovernor(args.frame_budget) if args.adaptive_quality else None
+    game = GameManager(array_store=args.array_store, starfield=starfield,
+                       dirty_rects=args.dirty_rects, seed=args.seed, profiler=profiler,
+                       tick_rate=args.tick_rate, decoupled=args.decoupled,
+                       render_fps=args.render_fps, max_frame_skip=args.max_frame_skip,
+                       governor=governor)
+    game.recorder = recorder
+    game.spectator = spectator
+    meteor_sprites.prerender()
+    if args.startup_times:
+        report_startup()
+    try:
+        run_windowed(game, args)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        report_profile(game.profiler, args.profile)
+        if governor is not None:
+            for frame, level, mean_ms in governor.changes:
+                print(f"Frame {frame}: quality level {level} (mean frame {mean_ms:.1f} ms)")
+
+record_startup("import", _import_started)
 
 if __name__ == "__main__":
     main()
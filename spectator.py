@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Live spectator stream for the space shooter.
+A SpectatorServer runs an asyncio event loop on a background thread and
+broadcasts every simulated frame's entity state (player, meteors, bullets,
+power-ups, score and timer) to any number of local TCP or Unix-socket
+subscribers. Each frame is encoded once as a delta against the previous one,
+with a full keyframe every keyframe_interval frames. A subscriber whose socket
+buffer is full simply misses frames and is resynchronized with a keyframe, so
+a slow viewer never stalls the game loop.
+
+    python space_shooter.py --spectate tcp:127.0.0.1:7777   # play and broadcast
+    python spectator.py watch tcp:127.0.0.1:7777            # reference viewer
+    python spectator.py bench --subscribers 4               # loopback benchmark
+"""
+
+import argparse
+import asyncio
+import math
+import multiprocessing
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+import space_shooter as game_module
+
+KEYFRAME = 0
+DELTA = 1
+LENGTH = struct.Struct("<I")  # prefix of every message on the wire
+ACK = struct.Struct("<I")  # viewer to server: the last frame it has taken in
+# kind, frame, base frame, score, remaining ms, player x, player y, lives, game over, power-up flags
+HEADER = struct.Struct("<BIIIIhhB?H")
+GROUP = struct.Struct("<HHH")  # removed, full and moved record counts
+FULL = "HhhB"  # stream id, x, y, detail
+MOVED = "Hbb"  # stream id, dx, dy
+GROUPS = ("meteors", "bullets", "power_ups")
+POWER_UP_INDEX = {name: index for index, name in enumerate(game_module.POWER_UP_NAMES)}
+
+
+def meteor_detail(meteor):
+    """1 for a large meteor, 0 for a small one"""
+    return 1 if meteor.size_type == "large" else 0
+
+
+def bullet_detail(bullet):
+    """0 for a bullet, 1 for a mega bullet, 2 for a laser beam"""
+    return 2 if bullet.continuous else 1 if bullet.mega else 0
+
+
+def power_up_detail(power_up):
+    """Index of the power-up type in POWER_UP_NAMES"""
+    return POWER_UP_INDEX[power_up.type]
+
+
+DETAILS = (meteor_detail, bullet_detail, power_up_detail)
+
+
+def parse_address(address):
+    """Split "tcp:HOST:PORT" or "unix:PATH" into (family, host or path, port)"""
+    family, _, rest = address.partition(":")
+    if family == "tcp":
+        host, _, port = rest.rpartition(":")
+        return family, host or "127.0.0.1", int(port)
+    if family == "unix":
+        return family, rest, None
+    raise ValueError(f"Spectator address must be tcp:HOST:PORT or unix:PATH, not {address!r}")
+
+
+class FrameEncoder:
+    """Turns successive game frames into keyframe and delta messages
+
+    Entities are tracked by the identity of their Python object and given
+    small stream ids, recycled once the entity disappears. Positions are
+    rounded to whole pixels, so a delta carries only the entities that
+    moved, appeared or vanished since the previous encoded frame.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.header = None  # HEADER values after kind and base frame
+        self.tracks = [{} for _ in GROUPS]  # id(entity) -> (stream id, x, y, detail)
+        self.free_ids = [[] for _ in GROUPS]
+        self.next_ids = [0] * len(GROUPS)
+
+    def encode(self, game):
+        """Encode the game's current frame as a delta against the previous encoded frame"""
+        player = game.player
+        flags = 0
+        for bit, attribute in enumerate(game_module.POWER_UP_ATTRIBUTES):
+            if getattr(player, attribute):
+                flags |= 1 << bit
+        base = self.frame if self.frame is not None else 0
+        self.frame = game.sim_clock.frame
+        self.header = (self.frame, game.score, round(game.get_remaining_time() * 1000),
+                       math.floor(player.x + 0.5), math.floor(player.y + 0.5),
+                       player.lives, game.game_over, flags)
+        out = bytearray(HEADER.pack(DELTA, self.frame, base, *self.header[1:]))
+        for group, (name, detail) in enumerate(zip(GROUPS, DETAILS)):
+            self.encode_group(out, group, getattr(game, name), detail)
+        return bytes(out)
+
+    def encode_group(self, out, group, entities, detail):
+        """Append one group's removed, new or changed, and moved records"""
+        previous = self.tracks[group]
+        free_ids = self.free_ids[group]
+        tracks = {}
+        full = []
+        moved = []
+        for entity in entities:
+            key = id(entity)
+            x = math.floor(entity.x + 0.5)
+            y = math.floor(entity.y + 0.5)
+            value = detail(entity)
+            track = previous.pop(key, None)
+            if track is None:
+                if free_ids:
+                    stream_id = free_ids.pop()
+                else:
+                    stream_id = self.next_ids[group]
+                    self.next_ids[group] += 1
+                full += (stream_id, x, y, value)
+            else:
+                stream_id, old_x, old_y, old_value = track
+                dx = x - old_x
+                dy = y - old_y
+                if old_value != value or not (-128 <= dx < 128 and -128 <= dy < 128):
+                    full += (stream_id, x, y, value)
+                elif dx or dy:
+                    moved += (stream_id, dx, dy)
+            tracks[key] = (stream_id, x, y, value)
+
+        # Whatever was not seen this frame has gone; its id is free for reuse next frame
+        removed = [track[0] for track in previous.values()]
+        free_ids += removed
+        self.tracks[group] = tracks
+        out += GROUP.pack(len(removed), len(full) // 4, len(moved) // 3)
+        out += struct.pack(f"<{len(removed)}H", *removed)
+        out += struct.pack("<" + FULL * (len(full) // 4), *full)
+        out += struct.pack("<" + MOVED * (len(moved) // 3), *moved)
+
+    def keyframe(self):
+        """Encode the last encoded frame in full, for a subscriber with no prior state"""
+        out = bytearray(HEADER.pack(KEYFRAME, self.frame, self.frame, *self.header[1:]))
+        for tracks in self.tracks:
+            out += GROUP.pack(0, len(tracks), 0)
+            out += struct.pack("<" + FULL * len(tracks),
+                               *[value for track in tracks.values() for value in track])
+        return bytes(out)
+
+    def state(self):
+        """Return the last encoded frame as SpectatorState.state() reports it"""
+        return self.header, [{track[0]: track[1:] for track in tracks.values()}
+                             for tracks in self.tracks]
+
+
+class SpectatorState:
+    """A subscriber's copy of the game, rebuilt from keyframe and delta messages"""
+
+    def __init__(self):
+        self.frame = None
+        self.header = None
+        self.groups = [{} for _ in GROUPS]  # stream id -> (x, y, detail)
+        self.keyframes = 0
+        self.deltas = 0
+        self.out_of_sync = 0
+
+    def apply(self, message):
+        """Update from one message; return False if a delta does not follow our frame"""
+        kind, frame, base, *header = HEADER.unpack_from(message)
+        if kind == DELTA and base != self.frame:
+            self.out_of_sync += 1
+            return False
+        if kind == KEYFRAME:
+            for entities in self.groups:
+                entities.clear()
+            self.keyframes += 1
+        else:
+            self.deltas += 1
+        self.frame = frame
+        self.header = (frame, *header)
+
+        offset = HEADER.size
+        for entities in self.groups:
+            removed, full, moved = GROUP.unpack_from(message, offset)
+            offset += GROUP.size
+            for stream_id in struct.unpack_from(f"<{removed}H", message, offset):
+                del entities[stream_id]
+            offset += 2 * removed
+            records = struct.unpack_from("<" + FULL * full, message, offset)
+            offset += 7 * full
+            for index in range(0, len(records), 4):
+                entities[records[index]] = records[index + 1:index + 4]
+            records = struct.unpack_from("<" + MOVED * moved, message, offset)
+            offset += 4 * moved
+            for index in range(0, len(records), 3):
+                x, y, value = entities[records[index]]
+                entities[records[index]] = (x + records[index + 1], y + records[index + 2], value)
+        return True
+
+    def state(self):
+        """Return (header values, [{stream id: (x, y, detail)} per group])"""
+        return self.header, self.groups
+
+
+class Subscriber:
+    """One connected viewer and its delivery counters"""
+
+    __slots__ = ("writer", "transport", "synced", "sent_frame", "acked", "sent", "dropped", "bytes")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.transport = writer.transport
+        self.synced = False  # has received every message since its last keyframe
+        self.sent_frame = None  # frame of the last message written
+        self.acked = None  # last frame the viewer acknowledged
+        self.sent = 0
+        self.dropped = 0
+        self.bytes = 0
+
+    def send(self, message, frame):
+        """Queue a framed message on the socket without waiting for it to drain"""
+        if self.acked is None:
+            self.acked = frame  # lag is counted from the first frame sent
+        self.sent_frame = frame
+        self.writer.write(message)
+        self.sent += 1
+        self.bytes += len(message)
+
+
+class SpectatorServer:
+    """Broadcasts frames to local subscribers from an event loop on its own thread
+
+    Attach it as ``game.spectator``; GameManager.step() calls publish() once
+    per frame. publish() only encodes and hands the message to the loop, so
+    the game thread never waits on a socket. Viewers acknowledge the frames
+    they take in; one with more than max_lag frames in flight misses frames
+    until it catches up, so socket buffers never fill with seconds of stale state.
+    """
+
+    def __init__(self, address, keyframe_interval=60, max_lag=30, high_water=64 * 1024,
+                 max_queued=4):
+        self.address = address
+        self.keyframe_interval = keyframe_interval  # frames between keyframes sent to everyone
+        self.max_lag = max_lag  # frames a viewer may fall behind before it misses frames
+        self.high_water = high_water  # unsent bytes at which any subscriber misses frames
+        self.max_queued = max_queued  # frames handed to the loop but not yet delivered
+        self.encoder = FrameEncoder()
+        self.subscribers = []
+        self.loop = None
+        self.thread = None
+        self.server = None
+        self.keyframe_requested = False
+        self.next_keyframe = 0
+        self.published = 0  # written by the game thread only
+        self.delivered = 0  # written by the loop thread only
+        self.coalesced = 0
+
+    def start(self):
+        """Start listening; return once the socket is bound"""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="spectator", daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.listen(), self.loop).result()
+        return self
+
+    async def listen(self):
+        """Open the TCP or Unix listening socket"""
+        family, host, port = parse_address(self.address)
+        if family == "tcp":
+            self.server = await asyncio.start_server(self.serve, host, port)
+            # Port 0 binds any free port; advertise the real one
+            self.address = f"tcp:{host}:{self.server.sockets[0].getsockname()[1]}"
+        else:
+            if os.path.exists(host):
+                os.unlink(host)
+            self.server = await asyncio.start_unix_server(self.serve, host)
+
+    async def serve(self, reader, writer):
+        """Register a subscriber and track its acknowledgements until it disconnects"""
+        subscriber = Subscriber(writer)
+        self.subscribers.append(subscriber)
+        self.keyframe_requested = True
+        try:
+            while True:
+                (subscriber.acked,) = ACK.unpack(await reader.readexactly(ACK.size))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+            writer.close()
+
+    def publish(self, game):
+        """Encode the current frame and queue it for every subscriber; called on the game thread"""
+        if not self.subscribers:
+            return
+        if self.published - self.delivered >= self.max_queued:
+            # The loop is behind: skip this frame; the next delta spans both
+            self.coalesced += 1
+            return
+        delta = self.encoder.encode(game)
+        frame = self.encoder.frame
+        periodic = frame >= self.next_keyframe
+        keyframe = None
+        if periodic or self.keyframe_requested:
+            self.keyframe_requested = False
+            keyframe = self.frame(self.encoder.keyframe())
+            if periodic:
+                self.next_keyframe = frame + self.keyframe_interval
+        self.published += 1
+        self.loop.call_soon_threadsafe(self.deliver, frame, self.frame(delta), keyframe, periodic)
+
+    @staticmethod
+    def frame(message):
+        """Prefix a message with its length"""
+        return LENGTH.pack(len(message)) + message
+
+    def deliver(self, frame, delta, keyframe, periodic):
+        """Write one frame to every subscriber that can take it; runs on the loop thread"""
+        self.delivered += 1
+        for subscriber in self.subscribers:
+            if subscriber.transport.is_closing():
+                continue
+            in_flight = subscriber.sent_frame - subscriber.acked if subscriber.sent else 0
+            unsent = subscriber.transport.get_write_buffer_size()
+            if in_flight > self.max_lag or unsent > self.high_water:
+                # Too slow: miss this frame and rejoin later from a keyframe
+                subscriber.synced = False
+                subscriber.dropped += 1
+                self.keyframe_requested = True
+            elif keyframe is not None and (periodic or not subscriber.synced):
+                subscriber.send(keyframe, frame)
+                subscriber.synced = True
+            elif subscriber.synced:
+                subscriber.send(delta, frame)
+            else:
+                subscriber.dropped += 1
+                self.keyframe_requested = True
+
+    def close(self, timeout=1.0):
+        """Send everyone a final keyframe, disconnect them and stop the loop thread"""
+        if self.loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.shutdown(timeout), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = None
+
+    async def shutdown(self, timeout):
+        """Flush the final state to every subscriber, then close the listening socket"""
+        self.server.close()
+        final = self.frame(self.encoder.keyframe()) if self.encoder.frame is not None else None
+        for subscriber in self.subscribers:
+            if not subscriber.transport.is_closing():
+                if final is not None:
+                    subscriber.send(final, self.encoder.frame)
+                # Half-close and let the viewer hang up: closing with its acks still unread
+                # would reset the connection and lose the final frame
+                subscriber.writer.write_eof()
+        deadline = self.loop.time() + timeout
+        while self.subscribers and self.loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        for subscriber in self.subscribers:
+            subscriber.transport.abort()  # a stalled viewer gives up its unsent frames
+        await self.server.wait_closed()
+        family, path, _ = parse_address(self.address)
+        if family == "unix" and os.path.exists(path):
+            os.unlink(path)
+
+    def stats(self):
+        """Return published, coalesced and per-subscriber delivery counts"""
+        return {
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "subscribers": [{"sent": subscriber.sent, "dropped": subscriber.dropped,
+                             "bytes": subscriber.bytes} for subscriber in self.subscribers],
+        }
+
+
+def connect(address, timeout=5.0):
+    """Open a blocking socket to a spectator server"""
+    family, host, port = parse_address(address)
+    if family == "tcp":
+        return socket.create_connection((host, port), timeout=timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(host)
+    return sock
+
+
+def read_messages(sock):
+    """Yield messages until the server hangs up, acknowledging each one's frame as it is taken"""
+    stream = sock.makefile("rb")
+    while True:
+        try:
+            prefix = stream.read(LENGTH.size)
+            length = LENGTH.unpack(prefix)[0] if len(prefix) == LENGTH.size else -1
+            message = stream.read(length) if length >= 0 else b""
+        except ConnectionError:
+            return
+        if length < 0 or len(message) < length:
+            return
+        yield message
+        try:
+            sock.sendall(ACK.pack(HEADER.unpack_from(message)[1]))
+        except OSError:
+            return  # the server has already closed its end
+
+
+def draw_state(screen, state, font):
+    """Draw a spectator state with plain shapes"""
+    screen.fill(game_module.BLACK)
+    header, (meteors, bullets, power_ups) = state.state()
+    if header is None:
+        return
+    frame, score, remaining_ms, player_x, player_y, lives, game_over, flags = header
+    for x, y, large in meteors.values():
+        radius = 20 if large else 10
+        pygame.draw.circle(screen, game_module.GRAY, (x + radius, y + radius), radius)
+    for x, y, kind in bullets.values():
+        if kind == 2:
+            pygame.draw.rect(screen, (255, 0, 255), (x, y, 6, game_module.SCREEN_HEIGHT))
+        else:
+            pygame.draw.rect(screen, game_module.ORANGE if kind else game_module.YELLOW,
+                             (x, y, 8, 16) if kind else (x, y, 4, 10))
+    for x, y, index in power_ups.values():
+        colour = game_module.POWER_UP_TYPES[game_module.POWER_UP_NAMES[index]][2]
+        pygame.draw.circle(screen, colour, (x + 12, y + 12), 12)
+    pygame.draw.polygon(screen, game_module.CYAN if flags & 2 else game_module.BLUE,
+                        [(player_x + 20, player_y), (player_x, player_y + 30),
+                         (player_x + 40, player_y + 30)])
+    status = f"Score {score}   Lives {lives}   Time {remaining_ms // 1000}   Frame {frame}"
+    if game_over:
+        status += "   GAME OVER"
+    screen.blit(font.render(status, True, game_module.WHITE), (10, 10))
+
+
+def watch(address, frames=None):
+    """Reference viewer: draw the stream in a window, or just count it with --frames"""
+    state = SpectatorState()
+    with connect(address) as sock:
+        sock.settimeout(None)
+        screen = font = None
+        if frames is None:
+            game_module.init_display()
+            screen = pygame.display.set_mode((game_module.SCREEN_WIDTH, game_module.SCREEN_HEIGHT))
+            pygame.display.set_caption(f"Spectating {address}")
+            font = game_module.text_cache.get_font(None, 24)
+        received = size = 0
+        for message in read_messages(sock):
+            received += 1
+            size += len(message)
+            if not state.apply(message):
+                continue
+            if screen is not None:
+                if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                    break
+                draw_state(screen, state, font)
+                pygame.display.flip()
+            elif received >= frames:
+                break
+    print(f"Received {received} messages ({size} bytes): {state.keyframes} keyframes, "
+          f"{state.deltas} deltas, {state.out_of_sync} skipped while out of sync")
+    return state
+
+
+def loopback_viewer(connection, delay=0.0, stalled=False):
+    """Benchmark subscriber process: decode every message, optionally sleeping after each
+
+    Receives the server address over connection and sends back its counters
+    and final state once the server hangs up. A stalled viewer connects but
+    never reads, and waits for the parent to say the run is over.
+    """
+    state = SpectatorState()
+    received = size = 0
+    with connect(connection.recv()) as sock:
+        sock.settimeout(None)
+        if stalled:
+            connection.recv()
+        else:
+            for message in read_messages(sock):
+                received += 1
+                size += len(message)
+                state.apply(message)
+                if delay:
+                    time.sleep(delay)
+    connection.send((received, size, state.keyframes, state.out_of_sync, state.state()))
+
+
+def benchmark(address, subscribers=4, slow=1, stalled=1, seed=1, frames=600, realtime=True):
+    """Play a headless game into loopback viewer processes; return timings and delivery counts"""
+    # Viewers are started before the server thread so no process forks with it running
+    kinds = [(0.0, False)] * subscribers + [(0.02, False)] * slow + [(0.0, True)] * stalled
+    viewers = []
+    for delay, stall in kinds:
+        connection, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=loopback_viewer, args=(child, delay, stall),
+                                          daemon=True)
+        process.start()
+        viewers.append((delay, stall, connection, process))
+    server = SpectatorServer(address).start()
+    for _, _, connection, _ in viewers:
+        connection.send(server.address)
+    while len(server.subscribers) < len(viewers):
+        time.sleep(0.001)
+
+    game = game_module.GameManager(headless=True, input_source=game_module.RandomInput(seed),
+                                   seed=seed)
+    step_ms = game.sim_clock.dt / 1000
+    publish = []
+    clock = time.perf_counter
+    start = clock()
+    for index in range(frames):
+        if game.game_over:
+            break
+        game.step()
+        before = clock()
+        server.publish(game)  # what step() does when game.spectator is set, timed on its own
+        publish.append((clock() - before) * 1e6)
+        if realtime:
+            time.sleep(max(0.0, start + (index + 1) * step_ms - clock()))
+    elapsed = clock() - start
+
+    stats = server.stats()
+    expected = server.encoder.state()
+    server.close()
+    results = []
+    for delay, stall, connection, process in viewers:
+        if stall:
+            connection.send(None)
+        received, size, keyframes, out_of_sync, state = connection.recv()
+        process.join()
+        results.append((delay, stall, received, size, keyframes, out_of_sync, state == expected))
+    publish.sort()
+    return {
+        "frames": len(publish),
+        "elapsed": elapsed,
+        "publish_us_mean": sum(publish) / len(publish),
+        "publish_us_p99": publish[int((len(publish) - 1) * 0.99)],
+        "published": stats["published"],
+        "coalesced": stats["coalesced"],
+        "viewers": results,
+    }
+
+
+def main(argv=None):
+    """Watch a live game or benchmark the broadcast over loopback"""
+    parser = argparse.ArgumentParser(description="Spectate a space shooter game")
+    commands = parser.add_subparsers(dest="command", required=True)
+    watch_parser = commands.add_parser("watch", help="show a live game")
+    watch_parser.add_argument("address", help="tcp:HOST:PORT or unix:PATH")
+    watch_parser.add_argument("--frames", type=int, default=None,
+                              help="count this many messages without opening a window")
+    bench_parser = commands.add_parser("bench", help="broadcast a headless game over loopback")
+    bench_parser.add_argument("--address", default="tcp:127.0.0.1:0")
+    bench_parser.add_argument("--subscribers", type=int, default=4, help="viewers that keep up")
+    bench_parser.add_argument("--slow", type=int, default=1, help="viewers that sleep 20 ms per message")
+    bench_parser.add_argument("--stalled", type=int, default=1, help="viewers that never read")
+    bench_parser.add_argument("--seed", type=int, default=1)
+    bench_parser.add_argument("--frames", type=int, default=600)
+    bench_parser.add_argument("--unpaced", action="store_true",
+                              help="step the game as fast as possible instead of at its tick rate")
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        watch(args.address, args.frames)
+        return
+
+    result = benchmark(args.address, args.subscribers, args.slow, args.stalled, args.seed,
+                       args.frames, not args.unpaced)
+    print(f"{result['frames']} frames in {result['elapsed']:.2f}s: publish "
+          f"{result['publish_us_mean']:.1f}/{result['publish_us_p99']:.1f} us mean/p99, "
+          f"{result['published']} published, {result['coalesced']} coalesced")
+    diverged = 0
+    for delay, stalled, received, size, keyframes, out_of_sync, final_matches in result["viewers"]:
+        kind = "stalled" if stalled else "slow" if delay else "fast"
+        final = "" if stalled else "  final state matches" if final_matches else "  final state DIFFERS"
+        print(f"  {kind:<8}{received:6d} messages {received / result['elapsed']:6.0f}/s "
+              f"{size / max(received, 1):7.1f} bytes avg {keyframes:4d} keyframes "
+              f"{out_of_sync:5d} out of sync{final}")
+        diverged += not stalled and not final_matches
+    return 1 if diverged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())